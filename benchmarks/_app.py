@@ -0,0 +1,47 @@
+"""
+Setup shared by the benchmarks driving `src.app:app` in-process.
+"""
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+from injector import singleton
+
+from src.app import app, injector
+from src.core.db.client import DbClient
+from src.core.db.models import Base
+
+
+@asynccontextmanager
+async def temporary_db_client(db_url: str | None = None) -> AsyncIterator[DbClient]:
+    """
+    Yields a client of the database at `db_url`, or of a temporary SQLite
+    database, with the tables of the app created.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_client = DbClient(
+            db_url or f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.db'}"
+        )
+        try:
+            await db_client.create_all(Base.metadata)
+            yield db_client
+        finally:
+            await db_client.dispose()
+
+
+@asynccontextmanager
+async def app_client(
+    db_url: str | None = None, base_url: str = "http://bench"
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yields an HTTP client of the app, with the app using the database at
+    `db_url`, or a temporary SQLite database.
+    """
+    async with temporary_db_client(db_url) as db_client:
+        injector.binder.bind(DbClient, to=db_client, scope=singleton)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url=base_url
+        ) as client:
+            yield client
@@ -0,0 +1,126 @@
+"""
+Login throughput and latency with scrypt password hashing.
+
+Drives `POST /api/pre/user/login` of `src.app:app` in-process against a
+temporary SQLite database, with the `PasswordHasher` thread pool and with
+hashing inline on the event loop. Besides the logins per second and their
+p50/p99 latency, it reports the p99 event loop lag, i.e. how long other
+requests would have been stalled.
+
+Usage:
+    python -m benchmarks.bench_login [--logins 400] [--concurrency 32] [--users 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Callable, TypeVar
+
+import httpx
+
+from benchmarks._app import app_client
+from src.app import injector
+from src.settings import (
+    PASSWORD_HASH_QUEUE_SIZE,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_SCRYPT_N,
+    PASSWORD_SCRYPT_P,
+    PASSWORD_SCRYPT_R,
+)
+from src.user.services.password_hasher import PasswordHasher
+
+T = TypeVar("T")
+
+
+class InlinePasswordHasher(PasswordHasher):
+    """Hashes on the event loop, as a login handler calling hashlib would."""
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return func(*args)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def measure_loop_lag(lags: list[float], stop: asyncio.Event) -> None:
+    interval = 0.005
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started_at - interval)
+
+
+async def run(
+    client: httpx.AsyncClient, users: list[dict], logins: int, concurrency: int
+) -> tuple[float, list[float], list[float]]:
+    remaining = iter(range(logins))
+    latencies: list[float] = []
+    lags: list[float] = []
+
+    async def worker() -> None:
+        for i in remaining:
+            started_at = time.perf_counter()
+            response = await client.post(
+                "/api/pre/user/login", json=users[i % len(users)]
+            )
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started_at)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(lags, stop))
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    await lag_task
+    return logins / elapsed, latencies, lags
+
+
+async def main(logins: int, concurrency: int, user_count: int) -> None:
+    async with app_client() as client:
+        users = [
+            {"email": f"bench{i}@example.com", "password": f"password {i}"}
+            for i in range(user_count)
+        ]
+        for user in users:
+            response = await client.post("/api/pre/user/signup", json=user)
+            response.raise_for_status()
+
+        print(
+            f"{'hashing':>12} {'logins/s':>10} {'p50 ms':>8} "
+            f"{'p99 ms':>8} {'loop lag p99 ms':>16}"
+        )
+        for name, hasher_class in (
+            ("inline", InlinePasswordHasher),
+            ("thread pool", PasswordHasher),
+        ):
+            hasher = hasher_class(
+                n=PASSWORD_SCRYPT_N,
+                r=PASSWORD_SCRYPT_R,
+                p=PASSWORD_SCRYPT_P,
+                max_workers=PASSWORD_HASH_WORKERS,
+                # Queue every login of the benchmark instead of rejecting
+                max_pending=max(PASSWORD_HASH_QUEUE_SIZE, concurrency),
+            )
+            injector.binder.bind(PasswordHasher, to=hasher)
+            logins_per_second, latencies, lags = await run(
+                client, users, logins, concurrency
+            )
+            hasher.shutdown()
+            print(
+                f"{name:>12} {logins_per_second:>10,.1f} "
+                f"{statistics.median(latencies) * 1000:>8.1f} "
+                f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+                f"{percentile(lags, 0.99) * 1000:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency, args.users))
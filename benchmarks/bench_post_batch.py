@@ -0,0 +1,78 @@
+"""
+Throughput of bulk post imports through the batch endpoint.
+
+Imports the same posts one request per post through `POST /api/pre/post/` and
+in batches through `POST /api/pre/post/batch`, driving `src.app:app` in-process
+against a temporary SQLite database.
+
+Usage:
+    python -m benchmarks.bench_post_batch [--posts 2000] [--batch-size 500]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks._app import app_client
+
+
+def make_posts(count: int) -> list[dict]:
+    return [
+        {
+            "title": f"title {i}",
+            "description": "description",
+            "created_at": "2024-01-01T00:00:00",
+        }
+        for i in range(count)
+    ]
+
+
+async def import_one_by_one(
+    client: httpx.AsyncClient, headers: dict, posts: list[dict]
+) -> None:
+    for post in posts:
+        response = await client.post("/api/pre/post/", json=post, headers=headers)
+        response.raise_for_status()
+
+
+async def import_in_batches(
+    client: httpx.AsyncClient, headers: dict, posts: list[dict], batch_size: int
+) -> None:
+    for start in range(0, len(posts), batch_size):
+        end = start + batch_size
+        batch = posts[start:end]
+        response = await client.post(
+            "/api/pre/post/batch", json={"posts": batch}, headers=headers
+        )
+        response.raise_for_status()
+
+
+async def main(posts: int, batch_size: int) -> None:
+    async with app_client() as client:
+        credentials = {"email": "bench@example.com", "password": "bench"}
+        response = await client.post("/api/pre/user/signup", json=credentials)
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+        results = {}
+        started_at = time.perf_counter()
+        await import_one_by_one(client, headers, make_posts(posts))
+        results["one by one"] = posts / (time.perf_counter() - started_at)
+        started_at = time.perf_counter()
+        await import_in_batches(client, headers, make_posts(posts), batch_size)
+        results[f"batches of {batch_size}"] = posts / (time.perf_counter() - started_at)
+
+        baseline = results["one by one"]
+        for name, posts_per_second in results.items():
+            print(
+                f"{name:>20}: {posts_per_second:,.0f} posts/s "
+                f"({posts_per_second / baseline:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.posts, args.batch_size))
@@ -0,0 +1,114 @@
+"""
+Benchmark of the post listing query.
+
+Compares the legacy listing path (look the user up, then load every post as an
+ORM entity) with the single joined, column-projected query used by
+`PostRepository.get_posts_with_user_email`. For every size it reports the rows
+per second and the peak memory allocated while loading the posts of one user.
+
+Usage:
+    python -m benchmarks.bench_post_listing [--sizes 10000 100000 1000000] [--db-url URL]
+
+Without `--db-url` a temporary SQLite database is used.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Sequence
+
+from sqlalchemy import insert, select
+
+from benchmarks._app import temporary_db_client
+from src.core.db.client import DbClient
+from src.core.unit_of_work import UnitOfWork
+from src.post.models import Post
+from src.post.services.post_repository import PostRepository
+from src.user.models import User
+
+INSERT_BATCH_SIZE = 10_000
+
+
+async def seed(db_client: DbClient, size: int) -> str:
+    """Create a user owning `size` posts and return its email."""
+    user_id = str(uuid.uuid4())
+    email = f"{user_id}@example.com"
+    created_at = datetime(2024, 1, 1)
+    async with db_client.connect() as conn, conn.begin():
+        await conn.execute(
+            insert(User), [{"id": user_id, "email": email, "password": "bench"}]
+        )
+        for offset in range(0, size, INSERT_BATCH_SIZE):
+            await conn.execute(
+                insert(Post),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": f"title {i}",
+                        "description": f"description {i}",
+                        "created_at": created_at + timedelta(seconds=i),
+                        "created_by_id": user_id,
+                    }
+                    for i in range(offset, min(offset + INSERT_BATCH_SIZE, size))
+                ],
+            )
+    return email
+
+
+async def legacy_listing(db_client: DbClient, email: str) -> Sequence:
+    """The listing path before it was reduced to a single projected query."""
+    async with UnitOfWork(db_client) as unit_of_work:
+        session = await unit_of_work.get_db_session()
+        async with session.begin():
+            users = await session.execute(select(User).filter(User.email == email))
+            user = users.scalars().first()
+            result = await session.execute(
+                select(Post).filter(Post.created_by_id == user.id)
+            )
+            return result.scalars().all()
+
+
+async def projected_listing(db_client: DbClient, email: str) -> Sequence:
+    async with UnitOfWork(db_client) as unit_of_work:
+        repository = PostRepository(unit_of_work, db_client)
+        return await repository.get_posts_with_user_email(email, limit=2**31 - 1)
+
+
+async def measure(
+    listing: Callable[[DbClient, str], Awaitable[Sequence]],
+    db_client: DbClient,
+    email: str,
+) -> tuple[float, float]:
+    """Return the rows per second and the peak memory in MiB of one listing."""
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    rows = await listing(db_client, email)
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(rows) / elapsed, peak / 2**20
+
+
+async def main(sizes: list[int], db_url: str | None) -> None:
+    async with temporary_db_client(db_url) as db_client:
+        print(f"{'posts':>10} {'path':>10} {'rows/s':>12} {'peak MiB':>10}")
+        for size in sizes:
+            email = await seed(db_client, size)
+            for name, listing in (
+                ("legacy", legacy_listing),
+                ("projected", projected_listing),
+            ):
+                rows_per_sec, peak_mib = await measure(listing, db_client, email)
+                print(f"{size:>10} {name:>10} {rows_per_sec:>12,.0f} {peak_mib:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.db_url))
@@ -0,0 +1,157 @@
+"""
+Benchmark of post search query latency.
+
+Seeds one user with posts made of words drawn from a Zipf-like vocabulary, then
+times searches for a common, a mid-frequency and a rare word. Search through
+`PostRepository.search_posts` (MySQL FULLTEXT) or the in-process
+`InvertedIndex` (other databases) is compared with a `LIKE '%term%'` scan.
+
+Usage:
+    python -m benchmarks.bench_post_search [--posts 1000000] [--runs 5] [--db-url URL]
+
+Without `--db-url` a temporary SQLite database is used.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import func, insert, or_, select
+
+from benchmarks._app import temporary_db_client
+from src.core.db.client import DbClient
+from src.core.unit_of_work import UnitOfWork
+from src.post.models import Post
+from src.post.services.post_repository import POST_RESPONSE_COLUMNS, PostRepository
+from src.post.services.post_search_index import InvertedIndex
+from src.user.models import User
+
+INSERT_BATCH_SIZE = 10_000
+VOCABULARY = [f"word{rank}" for rank in range(1, 20_001)]
+CUMULATIVE_WEIGHTS = list(
+    itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1))
+)
+PAGE_SIZE = 50
+
+
+def sentence(words: int) -> str:
+    return " ".join(random.choices(VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=words))
+
+
+async def seed(db_client: DbClient, size: int) -> str:
+    """Create a user owning `size` posts and return its id."""
+    user_id = str(uuid.uuid4())
+    created_at = datetime(2024, 1, 1)
+    async with db_client.connect() as conn, conn.begin():
+        await conn.execute(
+            insert(User),
+            [{"id": user_id, "email": f"{user_id}@example.com", "password": "bench"}],
+        )
+        for offset in range(0, size, INSERT_BATCH_SIZE):
+            await conn.execute(
+                insert(Post),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": sentence(4),
+                        "description": sentence(12),
+                        "created_at": created_at + timedelta(seconds=i),
+                        "created_by_id": user_id,
+                    }
+                    for i in range(offset, min(offset + INSERT_BATCH_SIZE, size))
+                ],
+            )
+    return user_id
+
+
+async def like_search(db_client: DbClient, user_id: str, term: str) -> int:
+    condition = (Post.created_by_id == user_id) & or_(
+        Post.title.like(f"%{term}%"), Post.description.like(f"%{term}%")
+    )
+    async with UnitOfWork(db_client) as unit_of_work:
+        session = await unit_of_work.get_db_session()
+        total_results = await session.scalar(select(func.count()).filter(condition))
+        await session.execute(
+            select(*POST_RESPONSE_COLUMNS)
+            .filter(condition)
+            .order_by(Post.created_at, Post.id)
+            .limit(PAGE_SIZE)
+        )
+    return total_results
+
+
+async def full_text_search(db_client: DbClient, user_id: str, term: str) -> int:
+    async with UnitOfWork(db_client) as unit_of_work:
+        repository = PostRepository(unit_of_work, db_client)
+        total_results, _ = await repository.search_posts(user_id, term, PAGE_SIZE, 0)
+    return total_results
+
+
+async def build_index(db_client: DbClient, user_id: str) -> InvertedIndex:
+    index = InvertedIndex()
+    async with UnitOfWork(db_client) as unit_of_work:
+        repository = PostRepository(unit_of_work, db_client)
+        async for rows in repository.stream_posts_by_user_id(user_id, 10_000):
+            for row in rows:
+                index.add(row.id, row.title, row.description)
+    return index
+
+
+def index_search(
+    index: InvertedIndex,
+) -> Callable[[DbClient, str, str], Awaitable[int]]:
+    async def search(db_client: DbClient, user_id: str, term: str) -> int:
+        total_results, ranked = index.search(term, PAGE_SIZE)
+        async with UnitOfWork(db_client) as unit_of_work:
+            repository = PostRepository(unit_of_work, db_client)
+            await repository.get_posts_by_ids([post_id for post_id, _ in ranked])
+        return total_results
+
+    return search
+
+
+async def main(posts: int, runs: int, db_url: str | None) -> None:
+    random.seed(0)
+    async with temporary_db_client(db_url) as db_client:
+        started_at = time.perf_counter()
+        user_id = await seed(db_client, posts)
+        print(f"seeded {posts:,} posts in {time.perf_counter() - started_at:.1f}s")
+
+        searches: dict[str, Callable[[DbClient, str, str], Awaitable[int]]] = {
+            "LIKE scan": like_search
+        }
+        if db_client.dialect_name == "mysql":
+            searches["FULLTEXT"] = full_text_search
+        else:
+            started_at = time.perf_counter()
+            index = await build_index(db_client, user_id)
+            print(
+                f"built the in-process index in {time.perf_counter() - started_at:.1f}s"
+            )
+            searches["in-process index"] = index_search(index)
+
+        print(f"{'term':>10} {'search':>17} {'matches':>10} {'median ms':>10}")
+        # A common, a mid-frequency and a rare word
+        for term in (VOCABULARY[0], VOCABULARY[99], VOCABULARY[9_999]):
+            for name, search in searches.items():
+                latencies = []
+                for _ in range(runs):
+                    started_at = time.perf_counter()
+                    matches = await search(db_client, user_id, term)
+                    latencies.append(time.perf_counter() - started_at)
+                median_ms = statistics.median(latencies) * 1000
+                print(f"{term:>10} {name:>17} {matches:>10,} {median_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.posts, args.runs, args.db_url))
@@ -0,0 +1,116 @@
+"""
+Requests per second of the post list endpoint with the UnitOfWork middleware.
+
+Compares the plain ASGI `UnitOfWorkMiddleware` with the previous
+`BaseHTTPMiddleware` implementation by driving `src.app:app` in-process against
+a temporary SQLite database.
+
+Usage:
+    python -m benchmarks.bench_uow_middleware [--requests 2000] [--concurrency 20] [--rounds 3]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+import httpx
+from injector import Injector
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+from benchmarks._app import app_client
+from src.app import app, injector
+from src.core.middleware import UnitOfWorkMiddleware
+from src.core.unit_of_work import UnitOfWork
+
+
+class LegacyUnitOfWorkMiddleware(BaseHTTPMiddleware):
+    """The UnitOfWorkMiddleware before it became a plain ASGI middleware."""
+
+    def __init__(self, app: ASGIApp, injector: Injector) -> None:
+        super().__init__(app)
+        self._injector = injector
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        async with self._injector.get(UnitOfWork) as unit_of_work:
+            response = await call_next(request)
+            if response.status_code >= 400:
+                await unit_of_work.rollback()
+
+            return response
+
+
+def use_middleware(middleware_class: type) -> None:
+    app.user_middleware = [
+        (
+            Middleware(middleware_class, injector=injector)
+            if middleware.cls in (UnitOfWorkMiddleware, LegacyUnitOfWorkMiddleware)
+            else middleware
+        )
+        for middleware in app.user_middleware
+    ]
+    app.middleware_stack = None  # Rebuilt on the next request
+
+
+async def run(
+    client: httpx.AsyncClient, headers: dict, requests: int, concurrency: int
+) -> float:
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            response = await client.get("/api/pre/post/", headers=headers)
+            response.raise_for_status()
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started_at)
+
+
+async def main(requests: int, concurrency: int, rounds: int) -> None:
+    async with app_client() as client:
+        credentials = {"email": "bench@example.com", "password": "bench"}
+        response = await client.post("/api/pre/user/signup", json=credentials)
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        for i in range(20):
+            await client.post(
+                "/api/pre/post/",
+                json={
+                    "title": f"title {i}",
+                    "description": "description",
+                    "created_at": "2024-01-01T00:00:00",
+                },
+                headers=headers,
+            )
+
+        results: dict[str, list[float]] = {}
+        for _ in range(rounds):
+            for name, middleware_class in (
+                ("BaseHTTPMiddleware", LegacyUnitOfWorkMiddleware),
+                ("plain ASGI", UnitOfWorkMiddleware),
+            ):
+                use_middleware(middleware_class)
+                await run(client, headers, requests // 10, concurrency)  # Warm up
+                rps = await run(client, headers, requests, concurrency)
+                results.setdefault(name, []).append(rps)
+        for name, rps in results.items():
+            print(
+                f"{name:>20}: {statistics.median(rps):,.0f} requests/s (median of {rounds})"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.rounds))
@@ -0,0 +1,128 @@
+"""
+Import time of the app, broken down by module and by package.
+
+Imports `src.app` in fresh interpreters with `-X importtime`, keeps the median
+of each module over the runs and prints the slowest modules by cumulative time
+and the packages adding the most time of their own. The run fails when the
+import takes longer than the budget, so a new eager import of a heavy
+dependency shows up before it slows down the start of new replicas.
+
+Import times include compiling modules without an up to date `.pyc`, e.g. with
+PYTHONDONTWRITEBYTECODE set, so compare runs from the same environment.
+
+Usage:
+    python -m benchmarks.import_time [--module src.app] [--runs 5] [--top 25]
+        [--budget-ms 2000]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+# Importing `src.app` takes about 1.3 s on a single slow CPU, with headroom
+DEFAULT_BUDGET_MS = 2000
+
+_LINE_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass
+class ModuleImport:
+    name: str
+    depth: int
+    self_us: float
+    cumulative_us: float
+
+
+def measure(module: str) -> list[ModuleImport]:
+    """
+    Imports `module` in a new interpreter and returns the import of every module
+    it loaded, in the order `-X importtime` reports them.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in process.stderr.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append(
+                ModuleImport(name, len(indent) // 2, int(self_us), int(cumulative_us))
+            )
+    return imports
+
+
+def median_imports(runs: list[list[ModuleImport]]) -> list[ModuleImport]:
+    """
+    Returns the median self and cumulative time of each module over the runs,
+    in the order of the first run.
+    """
+    by_name: dict[str, list[ModuleImport]] = defaultdict(list)
+    for run in runs:
+        for module_import in run:
+            by_name[module_import.name].append(module_import)
+    return [
+        ModuleImport(
+            module_import.name,
+            module_import.depth,
+            statistics.median(i.self_us for i in by_name[module_import.name]),
+            statistics.median(i.cumulative_us for i in by_name[module_import.name]),
+        )
+        for module_import in runs[0]
+    ]
+
+
+def print_report(imports: list[ModuleImport], module: str, top: int) -> None:
+    total_us = next(i.cumulative_us for i in imports if i.name == module)
+
+    print(f"Slowest modules by cumulative import time of {module}:")
+    print(f"{'module':<60} {'self ms':>9} {'cumul. ms':>10} {'share':>7}")
+    for module_import in sorted(imports, key=lambda i: -i.cumulative_us)[:top]:
+        name = "  " * min(module_import.depth, 8) + module_import.name
+        print(
+            f"{name[:60]:<60} {module_import.self_us / 1000:>9.1f} "
+            f"{module_import.cumulative_us / 1000:>10.1f} "
+            f"{module_import.cumulative_us / total_us:>7.1%}"
+        )
+
+    packages: dict[str, float] = defaultdict(float)
+    for module_import in imports:
+        packages[module_import.name.split(".")[0]] += module_import.self_us
+    print()
+    print("Packages by own import time:")
+    print(f"{'package':<30} {'ms':>9} {'share':>7}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<30} {self_us / 1000:>9.1f} {self_us / total_us:>7.1%}")
+    print()
+
+
+def main(module: str, runs: int, top: int, budget_ms: float) -> int:
+    imports = median_imports([measure(module) for _ in range(runs)])
+    print_report(imports, module, top)
+
+    total_ms = next(i.cumulative_us for i in imports if i.name == module) / 1000
+    if total_ms > budget_ms:
+        print(
+            f"Importing {module} took {total_ms:.0f} ms, over the {budget_ms:.0f} ms budget"
+        )
+        return 1
+    print(
+        f"Importing {module} took {total_ms:.0f} ms, within the {budget_ms:.0f} ms budget"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="src.app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+    sys.exit(main(args.module, args.runs, args.top, args.budget_ms))
@@ -0,0 +1,308 @@
+"""
+Load test of the API with a realistic mix of requests.
+
+Virtual users run concurrently, each picking its next request from a weighted
+mix of signup, login, create, list and delete. The throughput, error count and
+p50/p95/p99 latency of each operation are reported. By default `src.app:app`
+is driven in-process against a temporary SQLite database. `--db-url` points
+the app at another database, e.g. a local MySQL, and `--base-url` load-tests a
+running server instead.
+
+A run can be saved as a baseline JSON file and later runs compared against
+it: the run fails when an operation's throughput drops or its p95 latency
+rises by more than the threshold. Baselines depend on the machine, so compare
+runs from the same one.
+
+Usage:
+    python -m benchmarks.load_test [--requests 2000] [--concurrency 16]
+        [--mix signup=1,login=2,create=5,list=10,delete=2]
+        [--db-url URL | --base-url URL]
+        [--save-baseline benchmarks/baselines/sqlite.json]
+        [--baseline benchmarks/baselines/sqlite.json] [--threshold 0.25]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+PERCENTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+DEFAULT_MIX = "signup=1,login=2,create=5,list=10,delete=2"
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    password: str
+    headers: dict = field(default_factory=dict)
+    post_ids: list[str] = field(default_factory=list)
+
+
+@dataclass
+class OperationStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+        summary = {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "throughput": len(latencies) / elapsed,
+        }
+        for name, fraction in PERCENTILES.items():
+            summary[f"{name}_ms"] = (
+                latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+                * 1000
+                if latencies
+                else 0.0
+            )
+        return summary
+
+
+class LoadTest:
+    """
+    Runs the request mix with a pool of virtual users against one client.
+    """
+
+    # Users signed up during the run have no posts, which lists answer with a 404
+    EXPECTED_STATUSES = {"list": {200, 404}}
+
+    def __init__(self, client: httpx.AsyncClient, seed: int) -> None:
+        self._client = client
+        self._random = random.Random(seed)
+        self._emails = itertools.count()
+        self._run_id = f"{time.time_ns():x}"  # Keeps emails unique across runs
+        self.users: list[VirtualUser] = []
+        self.stats: dict[str, OperationStats] = {}
+
+    async def setup(self, users: int, posts_per_user: int) -> None:
+        for _ in range(users):
+            user = await self._signup()
+            response = await self._client.post(
+                "/api/pre/post/batch",
+                json={"posts": [self._post() for _ in range(posts_per_user)]},
+                headers=user.headers,
+            )
+            response.raise_for_status()
+            user.post_ids.extend(response.json()["post_ids"])
+
+    async def run(self, requests: int, concurrency: int, mix: dict[str, int]) -> float:
+        """
+        Sends `requests` requests from `concurrency` virtual users at once and
+        returns the elapsed seconds.
+        """
+        operations = {
+            "signup": self.signup,
+            "login": self.login,
+            "create": self.create,
+            "list": self.list_posts,
+            "delete": self.delete,
+        }
+        names = list(mix)
+        cum_weights = list(itertools.accumulate(mix.values()))
+        remaining = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in remaining:
+                name = self._random.choices(names, cum_weights=cum_weights)[0]
+                await self._measure(name, operations[name])
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started_at
+
+    async def signup(self) -> httpx.Response:
+        user = VirtualUser(
+            email=f"load-{self._run_id}-{next(self._emails)}@example.com",
+            password="load test password",
+        )
+        response = await self._client.post(
+            "/api/pre/user/signup",
+            json={"email": user.email, "password": user.password},
+        )
+        if response.is_success:
+            user.headers = {"Authorization": f"Bearer {response.json()['token']}"}
+            self.users.append(user)
+        return response
+
+    async def login(self) -> httpx.Response:
+        user = self._random.choice(self.users)
+        return await self._client.post(
+            "/api/pre/user/login",
+            json={"email": user.email, "password": user.password},
+        )
+
+    async def create(self) -> httpx.Response:
+        user = self._random.choice(self.users)
+        response = await self._client.post(
+            "/api/pre/post/", json=self._post(), headers=user.headers
+        )
+        if response.is_success:
+            user.post_ids.append(response.json()["post_id"])
+        return response
+
+    async def list_posts(self) -> httpx.Response:
+        user = self._random.choice(self.users)
+        return await self._client.get(
+            "/api/pre/post/", params={"limit": 20}, headers=user.headers
+        )
+
+    async def delete(self) -> httpx.Response:
+        user = self._random.choice(self.users)
+        if not user.post_ids:
+            return await self.create()
+        post_id = user.post_ids.pop(self._random.randrange(len(user.post_ids)))
+        return await self._client.delete(
+            "/api/pre/post/", params={"post_id": post_id}, headers=user.headers
+        )
+
+    async def _signup(self) -> VirtualUser:
+        response = await self.signup()
+        response.raise_for_status()
+        return self.users[-1]
+
+    async def _measure(
+        self, name: str, operation: Callable[[], Awaitable[httpx.Response]]
+    ) -> None:
+        stats = self.stats.setdefault(name, OperationStats())
+        started_at = time.perf_counter()
+        try:
+            response = await operation()
+        except httpx.HTTPError:
+            stats.errors += 1
+            return
+        stats.latencies.append(time.perf_counter() - started_at)
+        if response.status_code not in self.EXPECTED_STATUSES.get(name, {200}):
+            stats.errors += 1
+
+    def _post(self) -> dict:
+        return {
+            "title": f"post {self._random.randrange(1_000_000)}",
+            "description": "load test " * self._random.randint(1, 50),
+            "created_at": "2024-01-01T00:00:00",
+        }
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = int(weight)
+    unknown = set(weights) - {"signup", "login", "create", "list", "delete"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown operations: {sorted(unknown)}")
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the regressions of `results` against `baseline`.
+    """
+    regressions = []
+    for name, expected in baseline["operations"].items():
+        actual = results["operations"].get(name)
+        if actual is None:
+            continue
+        if actual["throughput"] < expected["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {actual['throughput']:.1f}/s, "
+                f"baseline {expected['throughput']:.1f}/s"
+            )
+        if actual["p95_ms"] > expected["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {actual['p95_ms']:.1f} ms, "
+                f"baseline {expected['p95_ms']:.1f} ms"
+            )
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    print(
+        f"{'operation':>10} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for name, summary in sorted(results["operations"].items()):
+        print(
+            f"{name:>10} {summary['requests']:>9} {summary['errors']:>7} "
+            f"{summary['throughput']:>9.1f} {summary['p50_ms']:>8.1f} "
+            f"{summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f}"
+        )
+    print(
+        f"{'total':>10} {results['requests']:>9} {'':>7} {results['throughput']:>9.1f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> int:
+    if args.base_url:
+        client_context = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        # Imported here so that testing a running server doesn't need the app
+        from benchmarks._app import app_client
+
+        client_context = app_client(args.db_url, base_url="http://load-test")
+
+    async with client_context as client:
+        load_test = LoadTest(client, seed=args.seed)
+        await load_test.setup(args.users, args.posts_per_user)
+        if args.warmup:
+            await load_test.run(args.warmup, args.concurrency, args.mix)
+            load_test.stats.clear()
+        elapsed = await load_test.run(args.requests, args.concurrency, args.mix)
+
+    results = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "throughput": args.requests / elapsed,
+        "operations": {
+            name: stats.summary(elapsed) for name, stats in load_test.stats.items()
+        },
+    }
+    print_results(results)
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%} of {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regression beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--posts-per-user", type=int, default=50)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--seed", type=int, default=0)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db-url", help="Database of the in-process app")
+    target.add_argument("--base-url", help="URL of a running server to test")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fraction of throughput drop or p95 rise counted as a regression",
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -4,4 +4,4 @@ echo "Apply migrations to database"
 python -m alembic upgrade head
 
 echo "Start application"
-python -m src
+python -m src --production
@@ -1,8 +1,29 @@
+import argparse
+import importlib.util
+
 import uvicorn
-from src.settings import AUTO_RELOAD
+from src.settings import (
+    AUTO_RELOAD,
+    SERVER_ACCESS_LOG,
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
+    SERVER_KEEP_ALIVE,
+    SERVER_LIMIT_CONCURRENCY,
+    SERVER_WORKERS,
+)
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="Run SERVER_WORKERS workers without auto reload, see the SERVER_* settings",
+    )
+    if parser.parse_args().production:
+        run_production()
+        return
+
     uvicorn.run(
         app="src.app:app",
         host="0.0.0.0",
@@ -12,5 +33,34 @@ def main() -> None:
     )
 
 
+def run_production() -> None:
+    """
+    Runs `SERVER_WORKERS` worker processes on uvloop and httptools when they are
+    installed. Caches are per worker, so several workers turn the post list cache
+    off by default, see `src.settings`.
+
+    On SIGTERM each worker stops accepting connections and lets the requests in
+    flight finish for up to `SERVER_GRACEFUL_SHUTDOWN_TIMEOUT` seconds.
+    """
+    uvicorn.run(
+        app="src.app:app",
+        host="0.0.0.0",
+        port=8080,
+        workers=SERVER_WORKERS,
+        loop="uvloop" if _is_installed("uvloop") else "asyncio",
+        http="httptools" if _is_installed("httptools") else "h11",
+        timeout_keep_alive=SERVER_KEEP_ALIVE,
+        backlog=SERVER_BACKLOG,
+        limit_concurrency=SERVER_LIMIT_CONCURRENCY,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
+        access_log=SERVER_ACCESS_LOG,
+        forwarded_allow_ips="*",
+    )
+
+
+def _is_installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
 if __name__ == "__main__":
     main()
@@ -1,11 +1,15 @@
 import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import Response
+from fastapi.responses import PlainTextResponse, Response
 from fastapi_injector import InjectorMiddleware, attach_injector
 from fastapi.middleware.cors import CORSMiddleware
 from injector import Injector
+from src.core.db.client import DbClient
 from src.core.di import CoreModule
 from src.core.exceptions import (
     handle_internal_exception,
@@ -13,13 +17,36 @@ from src.core.exceptions import (
     handle_validation_exception,
     RequestException,
 )
+from src.core.metrics import Metrics
 from src.core.middleware import (
+    BodySizeLimitMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
     UnitOfWorkMiddleware,
 )
 from src.core.routers import pre_router
 from src.core.schemas import Error
 from src.post.di import PostModule
+from src.post.services.post_list_cache import PostListCache
+from src.settings import (
+    DB_POOL_WARM_UP_SIZE,
+    DB_QUERY_HEADERS,
+    DB_REPEATED_QUERY_THRESHOLD,
+    DB_READ_YOUR_WRITES_WINDOW,
+    DB_REPLICA_URLS,
+    DB_STARTUP_TIMEOUT,
+    MAX_REQUEST_BODY_SIZE,
+    METRICS_ENABLED,
+    POST_BATCH_MAX_BODY_SIZE,
+    PROFILING_DIR,
+    PROFILING_INTERVAL,
+    PROFILING_MAX_FILES,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_SECRET,
+)
 from src.user.di import UserModule
+from src.user.services.password_hasher import PasswordHasher
 
 log = logging.getLogger(__name__)
 
@@ -27,11 +54,58 @@ log = logging.getLogger(__name__)
 injector = Injector([CoreModule(), UserModule(), PostModule()])
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Connects to the database before the app accepts requests and closes the
+    connections on shutdown.
+
+    The duration of each startup phase is stored in `app.state.startup_timings`
+    and exported as the `app_startup_duration_seconds` metric.
+    """
+    timings: dict[str, float] = {}
+    started_at = time.perf_counter()
+
+    db_client = injector.get(DbClient)
+    await db_client.wait_until_ready(DB_STARTUP_TIMEOUT)
+    timings["db_ready"] = time.perf_counter() - started_at
+
+    phase_started_at = time.perf_counter()
+    await db_client.warm_up(DB_POOL_WARM_UP_SIZE)
+    timings["pool_warm_up"] = time.perf_counter() - phase_started_at
+
+    # Build the singletons which are costly to create, e.g. the password hasher
+    # hashes a dummy password, instead of on the first request needing them
+    phase_started_at = time.perf_counter()
+    password_hasher = injector.get(PasswordHasher)
+    timings["services"] = time.perf_counter() - phase_started_at
+
+    timings["total"] = time.perf_counter() - started_at
+    app.state.startup_timings = timings
+    for phase, seconds in timings.items():
+        injector.get(Metrics).observe_startup(phase, seconds)
+    log.info(
+        "Started in %.3f s (%s)",
+        timings["total"],
+        ", ".join(
+            f"{phase} {seconds:.3f} s"
+            for phase, seconds in timings.items()
+            if phase != "total"
+        ),
+    )
+
+    yield
+
+    password_hasher.shutdown()
+    await db_client.dispose()
+
+
 app = FastAPI(
     title="Backend Developer Test",
     description="Backend Developer Test",
     version="0.1.0",
     docs_url="/",
+    lifespan=lifespan,
     responses={
         404: {
             "model": Error,
@@ -45,8 +119,23 @@ app = FastAPI(
 )
 attach_injector(app, injector)
 
-app.add_middleware(UnitOfWorkMiddleware, injector=injector)
+app.add_middleware(
+    UnitOfWorkMiddleware,
+    injector=injector,
+    # Without replicas every query already reads from the primary
+    read_your_writes_window=DB_READ_YOUR_WRITES_WINDOW if DB_REPLICA_URLS else 0,
+)
 app.add_middleware(InjectorMiddleware, injector=injector)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=MAX_REQUEST_BODY_SIZE,
+    route_limits={"/api/pre/post/batch": POST_BATCH_MAX_BODY_SIZE},
+)
+app.add_middleware(
+    QueryStatsMiddleware,
+    expose_headers=DB_QUERY_HEADERS,
+    repeated_threshold=DB_REPEATED_QUERY_THRESHOLD,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -54,9 +143,30 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if PROFILING_SAMPLE_RATE or PROFILING_SECRET:
+    app.add_middleware(
+        ProfilingMiddleware,
+        output_dir=PROFILING_DIR,
+        sample_rate=PROFILING_SAMPLE_RATE,
+        secret=PROFILING_SECRET,
+        interval=PROFILING_INTERVAL,
+        max_files=PROFILING_MAX_FILES,
+    )
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=injector.get(Metrics))
 
 app.include_router(pre_router, prefix="/api")
 
+if METRICS_ENABLED:
+    injector.get(Metrics).register_cache("post_list", injector.get(PostListCache).stats)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return PlainTextResponse(
+            injector.get(Metrics).render(),
+            media_type="text/plain; version=0.0.4",
+        )
+
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
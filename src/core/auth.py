@@ -1,12 +1,14 @@
 from datetime import datetime, timezone
 import logging
 from typing import Annotated
-from fastapi import Depends, Path
+from fastapi import Depends, Path, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi_injector import get_injector_instance
 import jwt
 from pydantic import BaseModel
 
 from src.core.errors import AuthErrors
+from src.user import interfaces
 from src.settings import (
     ACCESS_TOKEN_ALGORITHM,
     ACCESS_TOKEN_SECRET_KEY,
@@ -20,6 +22,24 @@ class AccessToken(BaseModel):
     expiration_time: datetime
 
 
+class Principal(BaseModel):
+    """
+    The authenticated user of the current request.
+    """
+
+    user_id: str
+    email: str
+
+
+class AuthContext:
+    """
+    Request-scoped holder of the principal, set once by `require_principal`.
+    """
+
+    def __init__(self) -> None:
+        self.principal: Principal | None = None
+
+
 def require_access_token(
     auth: Annotated[
         HTTPAuthorizationCredentials,
@@ -64,3 +84,26 @@ def require_valid_access_token(
         return
     else:
         raise AuthErrors.ACCESS_TOKEN_INVALID
+
+
+async def require_principal(
+    access_token: Annotated[AccessToken, Depends(require_access_token)],
+    _: Annotated[None, Depends(require_valid_access_token)],
+    request: Request,
+) -> Principal:
+    """
+    Authenticates the request and publishes its principal to the request scope.
+
+    The access token is decoded once (FastAPI caches `require_access_token` for
+    the request) and the user is resolved once, so handlers can inject the
+    `Principal` instead of verifying the token again.
+    """
+    injector = get_injector_instance(request.app)
+    user_repository = injector.get(interfaces.UserRepository)  # type: ignore[type-abstract]
+    user = await user_repository.get_token_by_email(access_token.email)
+    if not user:
+        raise AuthErrors.ACCESS_TOKEN_INVALID
+
+    principal = Principal(user_id=user.id, email=access_token.email)
+    injector.get(AuthContext).principal = principal
+    return principal
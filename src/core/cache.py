@@ -0,0 +1,227 @@
+import asyncio
+import functools
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+import cachetools
+
+T = TypeVar("T")
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a cache.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # Entries dropped because the cache was full or expired
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(cachetools.LRUCache):
+    """
+    Size-bounded LRU cache that counts its evictions.
+    """
+
+    def __init__(self, maxsize: int, stats: Optional[CacheStats] = None) -> None:
+        super().__init__(maxsize=maxsize)
+        self.stats = stats or CacheStats()
+
+    def popitem(self) -> tuple[Any, Any]:
+        # Called when the cache is full to evict the least recently used entry
+        item = super().popitem()
+        self.stats.evictions += 1
+        return item
+
+
+class TTLCache(cachetools.TTLCache):
+    """
+    Size-bounded LRU cache with a per-entry time to live that counts its evictions.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, stats: Optional[CacheStats] = None
+    ) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.stats = stats or CacheStats()
+
+    def expire(self, time: Optional[float] = None) -> Any:
+        # len() expires entries itself, so count the stored entries directly
+        size = cachetools.Cache.__len__(self)
+        expired = super().expire(time)
+        self.stats.evictions += size - cachetools.Cache.__len__(self)
+        return expired
+
+    def popitem(self) -> tuple[Any, Any]:
+        # Called when the cache is full to evict the least recently used entry
+        item = super().popitem()
+        self.stats.evictions += 1
+        return item
+
+
+class NamespacedCache:
+    """
+    Cache of entries grouped by namespace, e.g. by user id.
+
+    Namespaces are held in an LRU with a time to live and each namespace keeps
+    a bounded LRU of entries, so every entry of a namespace can be invalidated
+    at once. Concurrent misses for the same entry are coalesced into a single
+    load (single-flight).
+    """
+
+    def __init__(
+        self,
+        max_namespaces: int,
+        ttl: float,
+        entries_per_namespace: int,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Initializes the NamespacedCache.
+
+        Parameters:
+        - max_namespaces (int): The maximum number of namespaces cached.
+        - ttl (float): The number of seconds the entries of a namespace are cached for.
+        - entries_per_namespace (int): The maximum number of entries cached per namespace.
+        - enabled (bool): Whether entries are cached at all.
+        """
+        self._enabled = enabled
+        self._entries_per_namespace = entries_per_namespace
+        self._stats = CacheStats()
+        self._namespaces = TTLCache(maxsize=max_namespaces, ttl=ttl, stats=self._stats)
+        self._loading: dict[Hashable, dict[Hashable, asyncio.Future]] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
+
+    def get(self, namespace: Hashable, key: Hashable) -> Optional[Any]:
+        """
+        Returns a cached entry, or None on a cache miss.
+        """
+        if not self._enabled:
+            return None
+        entries = self._namespaces.get(namespace)
+        value = entries.get(key) if entries is not None else None
+        if value is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return value
+
+    def set(self, namespace: Hashable, key: Hashable, value: Any) -> None:  # noqa: A003
+        """
+        Caches an entry.
+        """
+        if not self._enabled:
+            return
+        entries = self._namespaces.get(namespace)
+        if entries is None:
+            entries = LRUCache(self._entries_per_namespace, stats=self._stats)
+            self._namespaces[namespace] = entries
+        entries[key] = value
+
+    def invalidate(self, namespace: Hashable) -> None:
+        """
+        Drops every cached entry of a namespace.
+
+        Loads in flight for the namespace are detached as well: their result is
+        not cached and later misses start a new load instead of joining them.
+        """
+        self._namespaces.pop(namespace, None)
+        self._loading.pop(namespace, None)
+
+    async def get_or_load(
+        self,
+        namespace: Hashable,
+        key: Hashable,
+        load: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Returns a cached entry, loading and caching it on a miss.
+
+        Only the first caller missing an entry runs `load`, the others wait for
+        its result. Exceptions are propagated to every waiting caller and are
+        not cached.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+
+        while True:
+            loading = self._loading.setdefault(namespace, {})
+            future = loading.get(key)
+            if future is None:
+                break
+            try:
+                # Shielded so a cancelled waiter doesn't cancel the shared load
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The caller running the load was cancelled, take over
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved when nobody else is waiting for it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        loading[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if self._loading.get(namespace, {}).get(key) is future:
+                self.set(namespace, key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if loading.get(key) is future:
+                del loading[key]
+                if not loading and self._loading.get(namespace) is loading:
+                    del self._loading[namespace]
+
+
+def async_cached(
+    cache: Callable[[Any], NamespacedCache],
+    key: Callable[..., tuple[Hashable, Hashable]],
+    skip: Optional[Callable[[Any], bool]] = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Memoizes an async method of a use case handler in a NamespacedCache.
+
+    Unlike `cachetools.cached`, the awaited result is cached instead of the
+    coroutine, and concurrent calls missing the same entry share one call.
+
+    :param cache: Returns the cache to use from the handler instance, e.g.
+        `operator.attrgetter("_post_list_cache")`.
+    :param key: Called with the arguments of the method, including the handler
+        instance, and returns the namespace and the key of the entry.
+    :param skip: Returns from the handler instance whether to call the method
+        without going through the cache.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            if skip is not None and skip(self):
+                return await func(self, *args, **kwargs)
+            namespace, entry_key = key(self, *args, **kwargs)
+            return await cache(self).get_or_load(
+                namespace,
+                entry_key,
+                functools.partial(func, self, *args, **kwargs),
+            )
+
+        return wrapper
+
+    return decorator
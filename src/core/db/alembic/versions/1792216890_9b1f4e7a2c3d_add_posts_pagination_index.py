@@ -0,0 +1,37 @@
+"""add posts pagination index
+
+Revision ID: 9b1f4e7a2c3d
+Revises: c286f00b5e9c
+Create Date: 2026-10-17 10:01:30.412871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9b1f4e7a2c3d"
+down_revision = "c286f00b5e9c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_posts_created_by_id_created_at_id",
+        "posts",
+        ["created_by_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "mysql":
+        # MySQL silently drops the index it created for the foreign key once the
+        # composite index can enforce it, and won't drop the composite one then,
+        # so restore the implicit index under its name if it is gone
+        indexes = {index["name"] for index in sa.inspect(bind).get_indexes("posts")}
+        if "created_by_id" not in indexes:
+            op.create_index("created_by_id", "posts", ["created_by_id"], unique=False)
+    op.drop_index("ix_posts_created_by_id_created_at_id", table_name="posts")
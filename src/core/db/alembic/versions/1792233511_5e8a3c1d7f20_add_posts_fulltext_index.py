@@ -0,0 +1,34 @@
+"""add posts fulltext index
+
+Revision ID: 5e8a3c1d7f20
+Revises: 9b1f4e7a2c3d
+Create Date: 2026-10-17 14:38:31.208455
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5e8a3c1d7f20"
+down_revision = "9b1f4e7a2c3d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Other databases search posts with an in-process index instead
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.create_index(
+        "ix_posts_title_description_fulltext",
+        "posts",
+        ["title", "description"],
+        unique=False,
+        mysql_prefix="FULLTEXT",
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.drop_index("ix_posts_title_description_fulltext", table_name="posts")
@@ -1,39 +1,217 @@
+import asyncio
+import itertools
+import time
 from asyncio import current_task
+from typing import Any, Callable, Sequence, cast
 
-from asyncpg.exceptions import PostgresError
-from sqlalchemy import text
+from sqlalchemy import MetaData, event, make_url, text
+from sqlalchemy.engine.default import DefaultDialect
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     async_scoped_session,
     async_sessionmaker,
+    AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.core.db.pool import InstrumentedQueuePool, PoolStats
 
 
 class DbClient:
-    def __init__(self, url: str, echo: bool = False) -> None:
-        self._engine = create_async_engine(url, echo=echo)
-        self._session_factory = async_scoped_session(
-            async_sessionmaker(
-                bind=self._engine,
-                autocommit=False,
-                expire_on_commit=False,
-            ),
-            current_task,
+    """
+    Engines and session factories of the primary database and its optional
+    read replicas.
+
+    Writes always go to the primary. Sessions and connections asked for as
+    read-only go to the replicas in turn, or to the primary when there is none.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        replica_urls: Sequence[str] = (),
+    ) -> None:
+        self._engine_options: dict[str, Any] = dict(
+            echo=echo,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
         )
+        self._engine = self._create_engine(url)
+        self._session_factory = _create_session_factory(self._engine)
+        self._replica_engines = [self._create_engine(url) for url in replica_urls]
+        self._replica_session_factories = [
+            _create_session_factory(engine) for engine in self._replica_engines
+        ]
+        self._next_replica = itertools.cycle(range(len(replica_urls)))
+        self._statement_listeners: list[Callable[[str, float], None]] = []
+
+    @property
+    def dialect_name(self) -> str:
+        """The name of the database dialect, e.g. "mysql" or "sqlite"."""
+        return self._engine.dialect.name
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replica_engines)
 
     async def is_ready(self) -> bool:
         try:
             async with self._engine.connect() as conn:
                 await conn.execute(text("select 1"))
                 return True
-        except (
-            ConnectionRefusedError,
-            SQLAlchemyError,
-            PostgresError,
-        ):
+        except (OSError, SQLAlchemyError):
             return False
 
-    async def create_session(self) -> AsyncSession:
+    async def wait_until_ready(self, timeout: float, interval: float = 0.5) -> None:
+        """
+        Polls `is_ready` until the primary database accepts connections.
+
+        :raises TimeoutError: If it doesn't within `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while not await self.is_ready():
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"The database isn't ready after {timeout} seconds")
+            await asyncio.sleep(interval)
+
+    async def warm_up(self, connections: int) -> None:
+        """
+        Opens up to `connections` connections to the primary and to each replica
+        at once and returns them to their pool, so the first requests find
+        connections ready. The warm-up is bounded by the pool size since
+        connections above it are closed when returned.
+        """
+        connections = min(connections, self._engine_options["pool_size"])
+        for engine in (self._engine, *self._replica_engines):
+            # Every connection that opened is closed, even when another failed
+            results = await asyncio.gather(
+                *(engine.connect().start() for _ in range(connections)),
+                return_exceptions=True,
+            )
+            await asyncio.gather(
+                *(
+                    result.close()
+                    for result in results
+                    if isinstance(result, AsyncConnection)
+                )
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    async def create_all(self, metadata: MetaData) -> None:
+        """
+        Creates the missing tables of `metadata` on the primary, e.g. for a
+        benchmark or a test database, which migrations don't set up.
+        """
+        async with self._engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+    async def dispose(self) -> None:
+        """
+        Closes the pooled connections of every engine.
+        """
+        for engine in (self._engine, *self._replica_engines):
+            await engine.dispose()
+
+    async def create_session(self, read_only: bool = False) -> AsyncSession:
+        if read_only and self._replica_session_factories:
+            return self._replica_session_factories[next(self._next_replica)]()
         return self._session_factory()
+
+    def connect(self, read_only: bool = False) -> AsyncConnection:
+        """
+        Returns a connection of its own, outside of any unit of work, e.g. to
+        stream results for longer than a request transaction lasts.
+        """
+        if read_only and self._replica_engines:
+            return self._replica_engines[next(self._next_replica)].connect()
+        return self._engine.connect()
+
+    def add_statement_listener(self, listener: Callable[[str, float], None]) -> None:
+        """
+        Calls `listener` with the SQL and the duration in seconds of every
+        statement executed by the engines.
+        """
+        if not self._statement_listeners:
+            for engine in (self._engine, *self._replica_engines):
+                _listen_to_statements(engine, self._statement_listeners)
+        self._statement_listeners.append(listener)
+
+    def get_pool_stats(self) -> PoolStats | None:
+        """
+        Returns the state of the primary connection pool and its checkout
+        timings, or None when the engine doesn't use a queue pool.
+        """
+        pool = self._engine.sync_engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            return pool.stats()
+        return None
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        options = dict(self._engine_options)
+        pool_options = {
+            option: options.pop(option)
+            for option in ("pool_size", "max_overflow", "pool_timeout")
+        }
+        # In-memory SQLite databases use a static pool which can't be sized
+        if issubclass(_get_default_pool_class(url), QueuePool):
+            options.update(poolclass=InstrumentedQueuePool, **pool_options)
+        return create_async_engine(url, **options)
+
+
+def _listen_to_statements(
+    engine: AsyncEngine, listeners: list[Callable[[str, float], None]]
+) -> None:
+    def before_cursor_execute(conn: Any, *args: Any) -> None:
+        conn.info.setdefault("statement_started_at", []).append(time.perf_counter())
+
+    def after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        seconds = time.perf_counter() - conn.info["statement_started_at"].pop()
+        for listener in listeners:
+            listener(statement, seconds)
+
+    def handle_error(context: Any) -> None:
+        # There is no connection when the error is failing to connect
+        if context.connection is None:
+            return
+        started_at = context.connection.info.get("statement_started_at")
+        if started_at:
+            started_at.pop()
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(sync_engine, "handle_error", handle_error)
+
+
+def _create_session_factory(engine: AsyncEngine) -> async_scoped_session:
+    return async_scoped_session(
+        async_sessionmaker(
+            bind=engine,
+            autocommit=False,
+            expire_on_commit=False,
+        ),
+        current_task,
+    )
+
+
+def _get_default_pool_class(url: str) -> type[Pool]:
+    parsed_url = make_url(url)
+    # Every dialect derives from DefaultDialect, which picks the pool class
+    dialect = cast(type[DefaultDialect], parsed_url.get_dialect())
+    return dialect.get_pool_class(parsed_url)
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+)
+
+from src.core.metrics import Histogram
+
+
+@dataclass
+class PoolStats:
+    """
+    State of a connection pool and its checkout timings.
+    """
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    # Time spent checking a connection out: waiting, connecting and pre-pinging
+    checkout_latency: Histogram
+    # Time spent waiting for a connection while the pool was exhausted
+    wait_time: Histogram
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records checkout latencies and waits.
+    """
+
+    def __init__(
+        self, creator: Any, pool_size: int = 5, max_overflow: int = 10, **kwargs: Any
+    ) -> None:
+        super().__init__(
+            creator, pool_size=pool_size, max_overflow=max_overflow, **kwargs
+        )
+        self._capacity = pool_size + max_overflow if max_overflow > -1 else None
+        self._checkouts = 0
+        self._timeouts = 0
+        self._checkout_latency = Histogram()
+        self._wait_time = Histogram()
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self._checkouts += 1
+            self._checkout_latency.observe(perf_counter() - started_at)
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=max(self.overflow(), 0),
+            checkouts=self._checkouts,
+            timeouts=self._timeouts,
+            checkout_latency=self._checkout_latency,
+            wait_time=self._wait_time,
+        )
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        exhausted = (
+            self._capacity is not None
+            and self.checkedin() == 0
+            and self.checkedout() >= self._capacity
+        )
+        if not exhausted:
+            return super()._do_get()
+
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            self._wait_time.observe(perf_counter() - started_at)
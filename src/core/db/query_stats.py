@@ -0,0 +1,93 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """
+    Number and duration of the statements executed while tracking queries.
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+    parent: Optional["QueryStats"] = field(default=None, repr=False)
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats: QueryStats | None = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.statements[statement] += 1
+            stats = stats.parent
+
+    def repeated(self, min_count: int = 2) -> dict[str, int]:
+        """
+        Returns the statements executed at least `min_count` times, a sign of an
+        N+1 query or of a lookup done twice.
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= min_count
+        }
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Counts the statements executed in the current context, e.g. by a request or
+    a test. The context variable is inherited by the greenlets SQLAlchemy runs
+    the statements in, and tracking can be nested.
+
+    Example:
+        with track_queries() as queries:
+            response = await client.post("/api/pre/user/login", json=credentials)
+        assert queries.count <= 2, queries.statements
+    """
+    stats = QueryStats(parent=_query_stats.get())
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+class QueryTracker:
+    """
+    Statement listener of a `DbClient` recording statements in the tracked
+    `QueryStats` and logging slow statements.
+
+    Slow statements are logged with their placeholders only, never with the
+    bound parameters, which may hold passwords, tokens or personal data.
+    """
+
+    def __init__(self, slow_query_threshold: float) -> None:
+        """
+        Initializes the QueryTracker.
+
+        Parameters:
+        - slow_query_threshold (float): The duration in seconds from which
+          statements are logged.
+        """
+        self._slow_query_threshold = slow_query_threshold
+
+    def __call__(self, statement: str, seconds: float) -> None:
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.record(statement, seconds)
+        if seconds >= self._slow_query_threshold:
+            log.warning(
+                "Slow query took %.1f ms: %s",
+                seconds * 1000,
+                " ".join(statement.split()),
+            )
@@ -6,19 +6,54 @@ from injector import (
     singleton,
 )
 
+from src.core.auth import AuthContext, Principal
 from src.core.db.client import DbClient
+from src.core.db.query_stats import QueryTracker
+from src.core.errors import AuthErrors
+from src.core.metrics import Metrics
 from src.core.unit_of_work import UnitOfWork
 from src.settings import (
     DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_REPLICA_URLS,
+    DB_SLOW_QUERY_THRESHOLD,
     DB_URL,
+    METRICS_ENABLED,
 )
 
 
 class CoreModule(Module):
     def configure(self, binder: Binder) -> None:
         binder.bind(UnitOfWork, scope=request_scope)
+        binder.bind(AuthContext, scope=request_scope)
+        binder.bind(Metrics, scope=singleton)
 
     @singleton
     @provider
-    def provide_db_client(self) -> DbClient:
-        return DbClient(DB_URL, DB_ECHO)
+    def provide_db_client(self, metrics: Metrics) -> DbClient:
+        db_client = DbClient(
+            DB_URL,
+            DB_ECHO,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            replica_urls=DB_REPLICA_URLS,
+        )
+        db_client.add_statement_listener(QueryTracker(DB_SLOW_QUERY_THRESHOLD))
+        if METRICS_ENABLED:
+            db_client.add_statement_listener(metrics.observe_statement)
+            metrics.register_pool(db_client.get_pool_stats)
+        return db_client
+
+    @request_scope
+    @provider
+    def provide_principal(self, auth_context: AuthContext) -> Principal:
+        if auth_context.principal is None:
+            raise AuthErrors.UNAUTHORIZED
+        return auth_context.principal
@@ -25,3 +25,19 @@ class AuthErrors:
         "You need to be authenticated to perform this request",
         401,
     )
+
+
+class PaginationErrors:
+    INVALID_CURSOR = RequestException(
+        "INVALID_CURSOR",
+        "The pagination cursor is invalid",
+        400,
+    )
+
+
+class RequestErrors:
+    PAYLOAD_TOO_LARGE = RequestException(
+        "PAYLOAD_TOO_LARGE",
+        "The request body is too large",
+        413,
+    )
@@ -0,0 +1,242 @@
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+if TYPE_CHECKING:
+    from src.core.cache import CacheStats
+    from src.core.db.pool import PoolStats
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Distribution of observed values over fixed buckets.
+
+    Observing is a bisect and a few integer increments, without locking: a
+    worker serves requests on a single event loop thread.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        # One count per bucket upper bound, plus one for values above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        """
+        Returns the number of observations less than or equal to each bucket
+        upper bound, followed by the total number of observations.
+        """
+        cumulative, total = [], 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class Metrics:
+    """
+    Collectors exposed in the Prometheus text format by the /metrics endpoint.
+
+    Collectors are plain dicts and integers updated from the event loop thread,
+    so recording a request or a statement never takes a lock.
+    """
+
+    def __init__(self) -> None:
+        self._request_duration: dict[tuple[str, str, int], Histogram] = {}
+        self._statement_duration: dict[str, Histogram] = {}
+        self._caches: dict[str, "CacheStats"] = {}
+        self._pool_stats: Callable[[], Optional["PoolStats"]] | None = None
+        self._startup_seconds: dict[str, float] = {}
+
+    def observe_request(
+        self, route: str, method: str, status_code: int, seconds: float
+    ) -> None:
+        key = (route, method, status_code)
+        histogram = self._request_duration.get(key)
+        if histogram is None:
+            histogram = self._request_duration[key] = Histogram()
+        histogram.observe(seconds)
+
+    def observe_statement(self, statement: str, seconds: float) -> None:
+        # Label statements by their operation to keep the cardinality low
+        operation = statement.lstrip().split(None, 1)[0].lower() if statement else ""
+        histogram = self._statement_duration.get(operation)
+        if histogram is None:
+            histogram = self._statement_duration[operation] = Histogram()
+        histogram.observe(seconds)
+
+    def observe_startup(self, phase: str, seconds: float) -> None:
+        self._startup_seconds[phase] = seconds
+
+    def register_cache(self, name: str, stats: "CacheStats") -> None:
+        self._caches[name] = stats
+
+    def register_pool(self, get_stats: Callable[[], Optional["PoolStats"]]) -> None:
+        self._pool_stats = get_stats
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        lines += _header("http_requests_total", "counter", "Number of HTTP requests.")
+        for (route, method, status_code), histogram in self._request_duration.items():
+            labels = _labels(route=route, method=method, status_code=status_code)
+            lines.append(f"http_requests_total{{{labels}}} {histogram.count}")
+        lines += _header(
+            "http_request_duration_seconds", "histogram", "Latency of HTTP requests."
+        )
+        for (route, method, status_code), histogram in self._request_duration.items():
+            lines += _histogram(
+                "http_request_duration_seconds",
+                histogram,
+                route=route,
+                method=method,
+                status_code=status_code,
+            )
+
+        lines += _header(
+            "db_statement_duration_seconds",
+            "histogram",
+            "Latency of database statements.",
+        )
+        for operation, histogram in self._statement_duration.items():
+            lines += _histogram(
+                "db_statement_duration_seconds", histogram, operation=operation
+            )
+
+        lines += _header(
+            "app_startup_duration_seconds", "gauge", "Duration of the startup phases."
+        )
+        for phase, seconds in self._startup_seconds.items():
+            lines.append(
+                f"app_startup_duration_seconds{{{_labels(phase=phase)}}} {seconds}"
+            )
+
+        for name, kind, description, attribute in (
+            ("cache_hits_total", "counter", "Number of cache hits.", "hits"),
+            ("cache_misses_total", "counter", "Number of cache misses.", "misses"),
+            (
+                "cache_evictions_total",
+                "counter",
+                "Number of cache evictions.",
+                "evictions",
+            ),
+            (
+                "cache_hit_ratio",
+                "gauge",
+                "Ratio of cache lookups that hit.",
+                "hit_ratio",
+            ),
+        ):
+            lines += _header(name, kind, description)
+            for cache, stats in self._caches.items():
+                lines.append(
+                    f"{name}{{{_labels(cache=cache)}}} {getattr(stats, attribute)}"
+                )
+
+        pool_stats = self._pool_stats() if self._pool_stats else None
+        if pool_stats:
+            for name, kind, description, value in (
+                (
+                    "db_pool_size",
+                    "gauge",
+                    "Size of the connection pool.",
+                    pool_stats.size,
+                ),
+                (
+                    "db_pool_checked_in",
+                    "gauge",
+                    "Idle pooled connections.",
+                    pool_stats.checked_in,
+                ),
+                (
+                    "db_pool_checked_out",
+                    "gauge",
+                    "Connections in use.",
+                    pool_stats.checked_out,
+                ),
+                (
+                    "db_pool_overflow",
+                    "gauge",
+                    "Connections above the pool size.",
+                    pool_stats.overflow,
+                ),
+                (
+                    "db_pool_checkouts_total",
+                    "counter",
+                    "Number of checkouts.",
+                    pool_stats.checkouts,
+                ),
+                (
+                    "db_pool_timeouts_total",
+                    "counter",
+                    "Number of checkout timeouts.",
+                    pool_stats.timeouts,
+                ),
+            ):
+                lines += _header(name, kind, description)
+                lines.append(f"{name} {value}")
+            for name, description, histogram in (
+                (
+                    "db_pool_checkout_duration_seconds",
+                    "Latency of connection checkouts.",
+                    pool_stats.checkout_latency,
+                ),
+                (
+                    "db_pool_wait_duration_seconds",
+                    "Time spent waiting for a connection while the pool was exhausted.",
+                    pool_stats.wait_time,
+                ),
+            ):
+                lines += _header(name, "histogram", description)
+                lines += _histogram(name, histogram)
+
+        return "\n".join(lines) + "\n"
+
+
+def _header(name: str, kind: str, description: str) -> list[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+
+
+def _labels(**labels: Any) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+
+
+def _histogram(name: str, histogram: Histogram, **labels: Any) -> list[str]:
+    label_prefix = _labels(**labels) + "," if labels else ""
+    bounds = [repr(bound) for bound in histogram.buckets] + ["+Inf"]
+    lines = [
+        f'{name}_bucket{{{label_prefix}le="{bound}"}} {count}'
+        for bound, count in zip(bounds, histogram.cumulative_counts())
+    ]
+    suffix = f"{{{_labels(**labels)}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
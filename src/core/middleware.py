@@ -1,27 +1,410 @@
-from typing import Awaitable, Callable
+import asyncio
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Mapping
+
 from injector import Injector
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.core.db.query_stats import track_queries
+from src.core.errors import RequestErrors
+from src.core.exceptions import handle_request_exception
+from src.core.metrics import Metrics
 from src.core.unit_of_work import UnitOfWork
 
+log = logging.getLogger(__name__)
+
+
+class UnitOfWorkMiddleware:
+    """
+    Commits the unit of work of a request right before its response starts, or
+    rolls it back when the response is an error or the request raised.
+
+    This is a plain ASGI middleware, so response messages are forwarded as they
+    are sent instead of going through the task and stream wrapping of
+    `BaseHTTPMiddleware`.
 
-class UnitOfWorkMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp, injector: Injector) -> None:
-        super().__init__(app)
+    With read replicas, a response to a request that wrote sets a
+    cookie holding the end of the read-your-writes window, and requests sent
+    with that cookie before the window ends are pinned to the primary.
+    """
+
+    PINNED_UNTIL_COOKIE = "db_primary_until"
+
+    def __init__(
+        self, app: ASGIApp, injector: Injector, read_your_writes_window: float = 0
+    ) -> None:
+        self.app = app
         self._injector = injector
+        self._read_your_writes_window = read_your_writes_window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._read_your_writes_window and self._is_pinned(scope):
+            self._injector.get(UnitOfWork).pin_to_primary()
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                # Commit before the client can see the response, so a client
+                # that got a success response can read its own writes
+                commit = message["status"] < 400
+                await self._end(commit=commit)
+                response_started = True
+                if (
+                    commit
+                    and self._read_your_writes_window
+                    and self._injector.get(UnitOfWork).has_written
+                ):
+                    self._pin(message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            if not response_started:
+                await self._end(commit=False)
+            raise
+        finally:
+            unit_of_work = self._injector.get(UnitOfWork)
+            if unit_of_work.has_db_session:
+                await unit_of_work.close()
+
+    def _is_pinned(self, scope: Scope) -> bool:
+        cookies = cookie_parser(Headers(scope=scope).get("cookie", ""))
+        try:
+            return float(cookies.get(self.PINNED_UNTIL_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _pin(self, message: Message) -> None:
+        window = self._read_your_writes_window
+        MutableHeaders(scope=message).append(
+            "set-cookie",
+            f"{self.PINNED_UNTIL_COOKIE}={time.time() + window:.3f}; "
+            f"Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=Lax",
+        )
+
+    async def _end(self, commit: bool) -> None:
+        unit_of_work = self._injector.get(UnitOfWork)
+        if commit:
+            await unit_of_work.commit()
+        else:
+            await unit_of_work.rollback()
+
+
+class MetricsMiddleware:
+    """
+    Records the count and the latency of requests per route, method and status
+    code.
 
-    async def dispatch(
+    Routes are labelled by the name of their endpoint function, which the router
+    stores in the request scope, so path parameters don't create new series.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Metrics) -> None:
+        self.app = app
+        self._metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = scope.get("endpoint")
+            self._metrics.observe_request(
+                getattr(endpoint, "__name__", "unmatched"),
+                scope["method"],
+                status_code,
+                time.perf_counter() - started_at,
+            )
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """
+    Rejects requests whose body is larger than a limit with a 413, before the
+    body is read whole, parsed and validated.
+
+    A declared `Content-Length` above the limit is rejected up front. Otherwise
+    the bytes are counted as the app receives them, and once the limit is
+    crossed `receive` raises and the response of the app is replaced with the
+    413, so a body sent without a length or with a false one is never buffered
+    past the limit either.
+    """
+
+    def __init__(
         self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        async with self._injector.get(UnitOfWork) as unit_of_work:
-            response = await call_next(request)
-            if response.status_code >= 400:
-                await unit_of_work.rollback()
-
-            return response
+        app: ASGIApp,
+        max_body_size: int,
+        route_limits: Mapping[str, int] | None = None,
+    ) -> None:
+        """
+        Initializes the BodySizeLimitMiddleware.
+
+        Parameters:
+        - app (ASGIApp): The wrapped application.
+        - max_body_size (int): The maximum body size in bytes of any request.
+        - route_limits (Mapping[str, int], optional): Maximum body sizes by request
+          path, e.g. `{"/api/pre/post/batch": 16 * 1024 * 1024}`, overriding
+          `max_body_size`.
+        """
+        self.app = app
+        self._max_body_size = max_body_size
+        self._route_limits = dict(route_limits or {})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._route_limits.get(scope["path"], self._max_body_size)
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    too_large = True
+                    raise _BodyTooLarge
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if too_large and not response_started:
+                # Drop whatever error response the app made of the exception
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except _BodyTooLarge:
+            pass
+        finally:
+            if too_large and not response_started:
+                await self._reject(scope, receive, send)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+        response = handle_request_exception(RequestErrors.PAYLOAD_TOO_LARGE)
+        # The rest of the body is not read, so don't keep the connection open
+        response.headers["connection"] = "close"
+        await response(scope, receive, send)
+
+
+class _StackSampler(threading.Thread):
+    """
+    Samples the stack of a thread at a fixed interval, keeping only the samples
+    taken while the coroutine of a given frame is running.
+    """
+
+    def __init__(self, thread_id: int, root: FrameType, interval: float) -> None:
+        super().__init__(name="profiling-sampler", daemon=True)
+        self.stacks: Counter[str] = Counter()
+        self._thread_id = thread_id
+        self._root = root
+        self._interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None and frame is not self._root:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_qualname} "
+                    f"({Path(code.co_filename).name}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            # Samples of other requests running on the event loop don't reach
+            # the root frame of the profiled request
+            if frame is not None and stack and not self._stopped.is_set():
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+class ProfilingMiddleware:
+    """
+    Samples the stacks of requests picked at random or sent with the secret
+    profiling header, and writes them to a directory in the collapsed stack
+    format read by flamegraph.pl and speedscope.
+
+    A sampler thread snapshots the event loop thread while the request runs and
+    keeps the stacks under this middleware, so the time spent in the other
+    middlewares, the injector, the handler and the repositories shows up, but
+    not other requests interleaved on the loop. Time waiting for the database
+    or a worker thread isn't sampled. One request is profiled at a time.
+
+    The middleware is only added to the app when profiling is configured, so it
+    costs nothing otherwise.
+    """
+
+    HEADER = "x-profile"
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        output_dir: str,
+        sample_rate: float = 0,
+        secret: str | None = None,
+        interval: float = 0.005,
+        max_files: int = 100,
+    ) -> None:
+        """
+        Initializes the ProfilingMiddleware.
+
+        Parameters:
+        - app (ASGIApp): The wrapped application.
+        - output_dir (str): The directory profiles are written to.
+        - sample_rate (float): The fraction of requests profiled.
+        - secret (str, optional): Requests with this value in the `X-Profile`
+          header are always profiled.
+        - interval (float): The number of seconds between two stack samples.
+        - max_files (int): The number of profiles kept, older ones are deleted.
+        """
+        self.app = app
+        self._output_dir = Path(output_dir)
+        self._sample_rate = sample_rate
+        self._secret = secret.encode() if secret else None
+        self._interval = interval
+        self._max_files = max_files
+        self._profiling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._profiling or not self._is_picked(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._profiling = True
+        sampler = _StackSampler(threading.get_ident(), sys._getframe(), self._interval)
+        started_at = time.time()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            self._profiling = False
+            endpoint = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, f"{started_at:.6f}-{endpoint}", sampler.stacks
+            )
+
+    def _is_picked(self, scope: Scope) -> bool:
+        if self._secret is not None:
+            header = Headers(scope=scope).get(self.HEADER)
+            if header is not None and hmac.compare_digest(
+                header.encode(), self._secret
+            ):
+                return True
+        return random.random() < self._sample_rate
+
+    def _write(self, name: str, stacks: Counter[str]) -> None:
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        path = self._output_dir / f"{name}.collapsed"
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+        )
+        profiles = sorted(self._output_dir.glob("*.collapsed"), key=os.path.getmtime)
+        for old_profile in profiles[: -self._max_files]:
+            old_profile.unlink(missing_ok=True)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the statements executed by each request and warns about requests
+    executing the same statement repeatedly, like N+1 queries do.
+
+    With `expose_headers`, the number of statements and their total duration in
+    milliseconds are sent in the `X-DB-Queries` and `X-DB-Time` response headers.
+    """
+
+    def __init__(
+        self, app: ASGIApp, expose_headers: bool = False, repeated_threshold: int = 2
+    ) -> None:
+        """
+        Initializes the QueryStatsMiddleware.
+
+        Parameters:
+        - app (ASGIApp): The wrapped application.
+        - expose_headers (bool): Whether to add the query headers to responses.
+        - repeated_threshold (int): The number of executions of one statement in
+          a request from which it is reported, 0 to never report.
+        """
+        self.app = app
+        self._expose_headers = expose_headers
+        self._repeated_threshold = repeated_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as queries:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start" and self._expose_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["x-db-queries"] = str(queries.count)
+                    headers["x-db-time"] = f"{queries.seconds * 1000:.3f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if self._repeated_threshold:
+                    for statement, count in queries.repeated(
+                        self._repeated_threshold
+                    ).items():
+                        log.warning(
+                            "%s %s executed the same statement %d times: %s",
+                            scope["method"],
+                            scope["path"],
+                            count,
+                            " ".join(statement.split()),
+                        )
@@ -0,0 +1,47 @@
+import base64
+from datetime import datetime
+
+from pydantic import BaseModel, ValidationError
+
+from src.core.errors import PaginationErrors
+
+
+class KeysetCursor(BaseModel):
+    """
+    Position of the last row of a page in a `(created_at, id)` keyset.
+
+    The total number of results is computed once for the first page and
+    carried along in the cursor so following pages don't have to count again.
+    """
+
+    created_at: datetime
+    id: str  # noqa: A003
+    page_number: int
+    total_results: int
+
+
+def encode_cursor(cursor: KeysetCursor) -> str:
+    """
+    Encode a keyset cursor into an opaque, url-safe token.
+
+    :param cursor: The cursor to encode.
+    :return: The encoded cursor.
+    """
+    return (
+        base64.urlsafe_b64encode(cursor.model_dump_json().encode()).decode().rstrip("=")
+    )
+
+
+def decode_cursor(token: str) -> KeysetCursor:
+    """
+    Decode an opaque cursor token produced by `encode_cursor`.
+
+    :param token: The encoded cursor.
+    :return: The decoded cursor.
+    :raises RequestException: If the token is not a valid cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        return KeysetCursor.model_validate_json(raw)
+    except (ValueError, ValidationError) as e:
+        raise PaginationErrors.INVALID_CURSOR from e
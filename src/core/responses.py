@@ -0,0 +1,48 @@
+from typing import Any, Generic, Mapping, TypeVar
+
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from src.settings import FAST_JSON_RESPONSES
+
+T = TypeVar("T")
+
+
+class ResponseSerializer(Generic[T]):
+    """
+    Precompiled JSON serializer of a response model.
+
+    Endpoints returning `serializer.response(content)` bypass FastAPI's response
+    handling: the content, already validated when it was built, is dumped to
+    bytes by pydantic-core in one pass instead of being validated against the
+    `response_model` again and walked by `jsonable_encoder`. Declare the same
+    type as `response_model` so the OpenAPI schema stays the same.
+    """
+
+    def __init__(self, type_: type[T]) -> None:
+        self._adapter = TypeAdapter(type_)
+
+    def dump_json(self, content: T) -> bytes:
+        return self._adapter.dump_json(content)
+
+    def response(
+        self,
+        content: T,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> Any:
+        """
+        Returns a JSON response of the content, or the content itself for FastAPI
+        to serialize when fast JSON responses are disabled.
+        """
+        if not FAST_JSON_RESPONSES:
+            return content
+        return Response(
+            self.dump_json(content),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+            background=background,
+        )
@@ -20,4 +20,5 @@ class PaginatedResult(BaseModel, Generic[EntityT]):
     page_number: int
     total_results: int
     results: Sequence[EntityT]
+    next_cursor: str | None = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -1,13 +1,48 @@
 from types import TracebackType
-from typing import Self, Type
+from typing import Callable, Self, Type
 
 from injector import Inject
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
 
 from src.core.db.client import DbClient
 
+# Key of `Session.info` set once a session flushed changes or executed DML
+_HAS_WRITTEN = "has_written"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context: UOWTransaction) -> None:
+    session.info[_HAS_WRITTEN] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[_HAS_WRITTEN] = True
+
 
 class UnitOfWork:
+    """
+    Database session of a request, with a single transaction.
+
+    The transaction begins with the first statement and is committed or rolled
+    back once for the whole request, so repositories only execute and flush.
+
+    Read-only queries may use a second session on a read replica. Once the
+    request wrote, or when it is pinned to the primary because its client wrote
+    recently, read-only queries use the primary session too so they see the
+    writes. Only a request that actually flushed changes, executed an INSERT,
+    UPDATE or DELETE, or holds pending changes counts as having written: merely
+    opening the primary session, which read-only queries also do without
+    replicas, doesn't.
+    """
+
     def __init__(
         self,
         db_client: Inject[DbClient],
@@ -15,27 +50,85 @@ class UnitOfWork:
         self._db_client = db_client
 
         self._db_session: AsyncSession | None = None
+        self._read_only_db_session: AsyncSession | None = None
+        self._pinned_to_primary = False
+        self._after_commit: list[Callable[[], None]] = []
+
+    @property
+    def has_db_session(self) -> bool:
+        """Whether a database session was opened by this unit of work."""
+        return self._db_session is not None or self._read_only_db_session is not None
+
+    @property
+    def has_written(self) -> bool:
+        """Whether the request flushed changes or executed DML on the primary."""
+        return self._db_session is not None and bool(
+            self._db_session.sync_session.info.get(_HAS_WRITTEN)
+        )
+
+    @property
+    def is_pinned_to_primary(self) -> bool:
+        """Whether read-only queries must go to the primary to see recent writes."""
+        if self._pinned_to_primary or self.has_written:
+            return True
+        # Changes not flushed yet are only visible to the primary session
+        session = self._db_session
+        return session is not None and bool(
+            session.new or session.dirty or session.deleted
+        )
+
+    def pin_to_primary(self) -> None:
+        """Sends the read-only queries of the request to the primary database."""
+        self._pinned_to_primary = True
+
+    async def get_db_session(self, read_only: bool = False) -> AsyncSession:
+        if read_only and self._db_client.has_replicas and not self.is_pinned_to_primary:
+            if not self._read_only_db_session:
+                self._read_only_db_session = await self._db_client.create_session(
+                    read_only=True
+                )
+            return self._read_only_db_session
 
-    async def get_db_session(self) -> AsyncSession:
         if not self._db_session:
             self._db_session = await self._db_client.create_session()
 
         return self._db_session
 
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Calls `callback` once the transaction is committed, e.g. to invalidate
+        a cache. Callbacks are dropped if the transaction is rolled back.
+        """
+        self._after_commit.append(callback)
+
     async def flush(self) -> None:
         if self._db_session:
             await self._db_session.flush()
 
     async def commit(self) -> None:
+        if self._read_only_db_session:
+            await self._read_only_db_session.commit()
         if self._db_session:
             await self._db_session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
 
     async def rollback(self) -> None:
+        self._after_commit.clear()
+        if self._read_only_db_session:
+            await self._read_only_db_session.rollback()
         if self._db_session:
             await self._db_session.rollback()
 
     async def close(self) -> None:
+        if self._read_only_db_session:
+            await self._read_only_db_session.close()
+            self._read_only_db_session = None
         if self._db_session:
+            # Sessions are scoped to the task and may be reused by the next unit
+            # of work of the same task
+            self._db_session.sync_session.info.pop(_HAS_WRITTEN, None)
             await self._db_session.close()
             self._db_session = None
 
@@ -1,7 +1,18 @@
-from injector import Binder, Module
+from injector import Binder, Module, provider, singleton
 
+from src.core.db.client import DbClient
 from src.post import interface
+from src.post.services.post_list_cache import PostListCache
 from src.post.services.post_repository import PostRepository
+from src.post.services.post_search_index import PostSearchIndex
+from src.settings import (
+    POST_CACHE_ENABLED,
+    POST_CACHE_MAX_USERS,
+    POST_CACHE_PAGES_PER_USER,
+    POST_CACHE_TTL,
+    POST_SEARCH_INDEX_MAX_USERS,
+    POST_SEARCH_INDEX_TTL,
+)
 
 
 class PostModule(Module):
@@ -15,3 +26,23 @@ class PostModule(Module):
         - binder (Binder): The injector binder used for binding implementations to interfaces.
         """
         binder.bind(interface.PostRepository, PostRepository)  # type: ignore[type-abstract]
+
+    @singleton
+    @provider
+    def provide_post_list_cache(self) -> PostListCache:
+        return PostListCache(
+            max_namespaces=POST_CACHE_MAX_USERS,
+            ttl=POST_CACHE_TTL,
+            entries_per_namespace=POST_CACHE_PAGES_PER_USER,
+            enabled=POST_CACHE_ENABLED,
+        )
+
+    @singleton
+    @provider
+    def provide_post_search_index(self, db_client: DbClient) -> PostSearchIndex:
+        return PostSearchIndex(
+            # MySQL searches its FULLTEXT index instead
+            enabled=db_client.dialect_name != "mysql",
+            max_users=POST_SEARCH_INDEX_MAX_USERS,
+            ttl=POST_SEARCH_INDEX_TTL,
+        )
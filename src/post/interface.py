@@ -1,4 +1,15 @@
-from typing import Protocol, runtime_checkable, List, Optional
+from typing import (
+    AsyncIterator,
+    Protocol,
+    runtime_checkable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from sqlalchemy import Row
+from src.core.pagination import KeysetCursor
 from src.post.models import Post
 from src.post.schemas import (
     Post as PostSchema,
@@ -9,8 +20,30 @@ from src.post.schemas import (
 
 @runtime_checkable
 class PostRepository(Protocol):
-    async def delete_by_id(self, post_id: int) -> None:
-        """Delete a post by its ID."""
+    async def delete_by_id(self, post_id: str, user_id: str) -> bool:
+        """Delete a post of a user by its ID, returning whether it was deleted."""
+        ...
+
+    async def get_posts_by_ids(self, ids: Sequence[str]) -> Sequence[Row]:
+        """Retrieve the post rows with the given IDs."""
+        ...
+
+    async def search_posts(
+        self, user_id: str, query: str, limit: int, offset: int
+    ) -> Tuple[int, Sequence[Row]]:
+        """Full-text search the posts of a user, best match first."""
+        ...
+
+    def stream_posts_by_user_id(
+        self, user_id: str, chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream the post rows of a user in chunks, ordered by (created_at, id)."""
+        ...
+
+    async def delete_many(
+        self, ids: Sequence[str], user_id: str, chunk_size: int
+    ) -> Set[str]:
+        """Delete the posts of a user by ID and return the IDs that were deleted."""
         ...
 
     async def get_by_id(self, post_id: int) -> PostResponseSchema:
@@ -21,6 +54,16 @@ class PostRepository(Protocol):
         """Create a new post."""
         ...
 
-    async def get_posts_with_user_email(self, email):
-        """Retrieve all posts by user email."""
+    async def create_many(self, posts: Sequence[Post]) -> List[str]:
+        """Create posts with a single multi-row insert and return their IDs."""
+        ...
+
+    async def get_posts_with_user_email(
+        self,
+        email: str,
+        limit: int,
+        after: Optional[KeysetCursor] = None,
+        count_total: bool = False,
+    ) -> Sequence[Row]:
+        """Retrieve a page of post rows by user email, ordered by (created_at, id)."""
         ...
@@ -1,5 +1,5 @@
 from typing import Optional
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from src.core.db.models import Base
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -11,6 +11,19 @@ class Post(Base):
     """
 
     __tablename__ = "posts"
+    __table_args__ = (
+        # Backs keyset pagination of a user's posts ordered by (created_at, id)
+        Index(
+            "ix_posts_created_by_id_created_at_id", "created_by_id", "created_at", "id"
+        ),
+        # Backs post search, other databases use an in-process index instead
+        Index(
+            "ix_posts_title_description_fulltext",
+            "title",
+            "description",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
+    )
 
     id: Mapped[str] = mapped_column(String(255), primary_key=True)  # noqa: A003
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=False)
@@ -1,51 +1,41 @@
 from datetime import datetime
 from typing import Annotated
-from cachetools import TTLCache
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Body
+from fastapi import APIRouter, Depends, status, Body, Query
+from fastapi.responses import StreamingResponse
 from fastapi_injector import Injected
-from src.core.auth import require_valid_access_token
+from src.core.auth import require_principal
+from src.core.responses import ResponseSerializer
+from src.core.schemas import PaginatedResult
 from src.post.schemas import (
     AddPostResponseSchema,
+    AddPostsResponseSchema,
     PostResponseSchema,
+    PostSearchResultSchema,
     DeletePostResponse,
+    DeletePostsResponse,
 )
 from src.post.use_cases.create_a_post import CreateAPost
+from src.post.use_cases.create_posts import CreatePosts
 from src.post.use_cases.delete_a_post import DeleteAPost
+from src.post.use_cases.delete_posts import DeletePosts
+from src.post.use_cases.export_posts import ExportPosts
 from src.post.use_cases.get_posts import GetAllPosts
+from src.post.use_cases.search_posts import SearchPosts
 from src.core.use_cases import UseCase
-
-# Initialize cache
-cache = TTLCache(maxsize=1000, ttl=300)
+from src.settings import POST_PAGE_DEFAULT_SIZE, POST_PAGE_MAX_SIZE
 
 # Initialize API router
 router = APIRouter(
-    prefix="/post", tags=["posts"], dependencies=[Depends(require_valid_access_token)]
+    prefix="/post", tags=["posts"], dependencies=[Depends(require_principal)]
 )
 
-
-async def get_access_token(request: Request):
-    """
-    Function to extract and validate the access token from the request headers.
-
-    Args:
-        request (Request): The incoming request object.
-
-    Returns:
-        str: The extracted access token.
-
-    Raises:
-        HTTPException: If the authorization header is missing or invalid.
-    """
-    authorization = request.headers.get("Authorization")
-    if authorization is None:
-        raise HTTPException(status_code=401, detail="Authorization header is missing")
-    try:
-        token_type, token = authorization.split()
-        if token_type.lower() != "bearer":
-            raise HTTPException(status_code=401, detail="Invalid token type")
-        return token
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid authorization header")
+# Serializers compiled once at import rather than on every response
+add_post_serializer = ResponseSerializer(AddPostResponseSchema)
+add_posts_serializer = ResponseSerializer(AddPostsResponseSchema)
+post_page_serializer = ResponseSerializer(PaginatedResult[PostResponseSchema])
+search_page_serializer = ResponseSerializer(PaginatedResult[PostSearchResultSchema])
+delete_post_serializer = ResponseSerializer(DeletePostResponse)
+delete_posts_serializer = ResponseSerializer(DeletePostsResponse)
 
 
 class AnnotatedCreatePost(UseCase):
@@ -58,7 +48,6 @@ class AnnotatedCreatePost(UseCase):
 async def create_a_post(
     use_case: Annotated[AnnotatedCreatePost, Body()],
     handler: Annotated[CreateAPost.Handler, Injected(CreateAPost.Handler)],
-    request: Request,
 ) -> AddPostResponseSchema:
     """
     Endpoint to create a new post.
@@ -66,52 +55,113 @@ async def create_a_post(
     Args:
         use_case (CreateAPost): The use case instance for creating a post.
         handler (CreateAPost.Handler): The handler for executing the use case.
-        request (Request): The incoming request object.
 
     Returns:
         AddPostResponseSchema: The response schema containing the ID of the created post.
-
-    Raises:
-        HTTPException: If the payload size exceeds 1 MB.
     """
-    total_size = len(use_case.json())
-    if total_size > 1024 * 1024:
-        raise HTTPException(status_code=413, detail="Payload size exceeds 1 MB")
-    token = await get_access_token(request)
     use_case_dict = dict(use_case)
-    return await handler.execute(CreateAPost(**use_case_dict, token=token))
+    return add_post_serializer.response(
+        await handler.execute(CreateAPost(**use_case_dict))
+    )
+
+
+@router.post(
+    "/batch",
+    description="Create posts in bulk",
+    response_model=AddPostsResponseSchema,
+)
+async def create_posts(
+    use_case: CreatePosts,
+    handler: Annotated[CreatePosts.Handler, Injected(CreatePosts.Handler)],
+) -> AddPostsResponseSchema:
+    """
+    Endpoint to create several posts in one request.
+
+    Args:
+        use_case (CreatePosts): The use case instance containing the posts to create.
+        handler (CreatePosts.Handler): The handler for executing the use case.
+
+    Returns:
+        AddPostsResponseSchema: The response schema containing the IDs of the created posts.
+    """
+    return add_posts_serializer.response(await handler.execute(use_case))
 
 
 @router.get(
-    "/", description="Get all posts", response_model=list[PostResponseSchema] | None
+    "/",
+    description="Get all posts, one page at a time",
+    response_model=PaginatedResult[PostResponseSchema] | None,
 )
 async def get_all_post(
-    use_case: Annotated[GetAllPosts, Depends()],
     handler: Annotated[GetAllPosts.Handler, Injected(GetAllPosts.Handler)],
-    request: Request,
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=POST_PAGE_MAX_SIZE)] = POST_PAGE_DEFAULT_SIZE,
 ):
     """
-    Endpoint to retrieve all posts.
+    Endpoint to retrieve the posts of the current user, one page at a time.
 
     Args:
-        use_case (GetAllPosts): The use case instance for getting all posts.
         handler (GetAllPosts.Handler): The handler for executing the use case.
-        request (Request): The incoming request object.
+        cursor (str, optional): The `next_cursor` returned with the previous page.
+        limit (int): The maximum number of posts per page.
 
     Returns:
-        list[PostResponseSchema]: The response schema containing a list of post data.
+        PaginatedResult[PostResponseSchema]: The response schema containing a page of post data.
     """
-    url_key = str(request.headers.get("authorization"))
-    cached_data = cache.get(url_key)
-    if cached_data:
-        return cache.get("data")  # Return cached data directly
-    token = await get_access_token(request)
-    use_case.token = token
-    response_data = await handler.execute(use_case)
-    if response_data:
-        cache[url_key] = url_key
-        cache["data"] = response_data
-        return response_data
+    return post_page_serializer.response(
+        await handler.execute(GetAllPosts(cursor=cursor, limit=limit))
+    )
+
+
+@router.get(
+    "/search",
+    description="Search posts by title and description, best match first",
+    response_model=PaginatedResult[PostSearchResultSchema],
+)
+async def search_posts(
+    handler: Annotated[SearchPosts.Handler, Injected(SearchPosts.Handler)],
+    query: Annotated[str, Query(min_length=1, max_length=255)],
+    page: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[int, Query(ge=1, le=POST_PAGE_MAX_SIZE)] = POST_PAGE_DEFAULT_SIZE,
+) -> PaginatedResult[PostSearchResultSchema]:
+    """
+    Endpoint to search the posts of the current user.
+
+    Args:
+        handler (SearchPosts.Handler): The handler for executing the use case.
+        query (str): The search terms, a post matches if it contains any of them.
+        page (int): The page of the ranked results, starting at 1.
+        limit (int): The maximum number of posts per page.
+
+    Returns:
+        PaginatedResult[PostSearchResultSchema]: The response schema containing a page of
+        matching posts.
+    """
+    return search_page_serializer.response(
+        await handler.execute(SearchPosts(query=query, page=page, limit=limit))
+    )
+
+
+@router.get(
+    "/export",
+    description="Export all posts as NDJSON, one post per line",
+    response_class=StreamingResponse,
+)
+async def export_posts(
+    handler: Annotated[ExportPosts.Handler, Injected(ExportPosts.Handler)],
+) -> StreamingResponse:
+    """
+    Endpoint to stream every post of the current user.
+
+    Args:
+        handler (ExportPosts.Handler): The handler for executing the use case.
+
+    Returns:
+        StreamingResponse: NDJSON lines, each one a post response schema.
+    """
+    return StreamingResponse(
+        await handler.execute(ExportPosts()), media_type="application/x-ndjson"
+    )
 
 
 @router.delete(
@@ -123,7 +173,6 @@ async def get_all_post(
 async def delete_a_post(
     post_id: str,
     handler: Annotated[DeleteAPost.Handler, Injected(DeleteAPost.Handler)],
-    request: Request,
 ) -> DeletePostResponse:
     """
     Endpoint to delete a post.
@@ -131,10 +180,33 @@ async def delete_a_post(
     Args:
         post_id (DeleteAPost): The use case instance for deleting a post.
         handler (DeleteAPost.Handler): The handler for executing the use case.
-        request (Request): The incoming request object.
 
     Returns:
         DeletePostResponse: The response indicating the success of the operation.
     """
-    token = await get_access_token(request)
-    return await handler.execute(DeleteAPost(token=token, post_id=post_id))
+    return delete_post_serializer.response(
+        await handler.execute(DeleteAPost(post_id=post_id))
+    )
+
+
+@router.delete(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    description="Delete posts in bulk",
+    response_model=DeletePostsResponse,
+)
+async def delete_posts(
+    use_case: DeletePosts,
+    handler: Annotated[DeletePosts.Handler, Injected(DeletePosts.Handler)],
+) -> DeletePostsResponse:
+    """
+    Endpoint to delete several posts in one request.
+
+    Args:
+        use_case (DeletePosts): The use case instance containing the IDs of the posts to delete.
+        handler (DeletePosts.Handler): The handler for executing the use case.
+
+    Returns:
+        DeletePostsResponse: The response containing the outcome for each post.
+    """
+    return delete_posts_serializer.response(await handler.execute(use_case))
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel
 
 
@@ -24,6 +25,14 @@ class PostResponseSchema(BaseModel):
     created_at: datetime  # Timestamp indicating when the post was created
 
 
+class PostSearchResultSchema(PostResponseSchema):
+    """
+    Pydantic model representing a post matching a search.
+    """
+
+    score: float  # Relevance of the post, higher is better
+
+
 class GetPostRequestSchema(BaseModel):
     """
     Pydantic model representing the request to get a post.
@@ -40,6 +49,14 @@ class AddPostResponseSchema(BaseModel):
     post_id: str  # ID of the newly added post
 
 
+class AddPostsResponseSchema(BaseModel):
+    """
+    Pydantic model representing the response after adding posts in bulk.
+    """
+
+    post_ids: list[str]  # IDs of the newly added posts, in request order
+
+
 class DeletePostRequestSchema(BaseModel):
     """
     Pydantic model representing the request to delete a post.
@@ -54,3 +71,20 @@ class DeletePostResponse(BaseModel):
     """
 
     success: str  # Indicates the success message after deleting the post
+
+
+class DeletePostOutcome(BaseModel):
+    """
+    Pydantic model representing the outcome of deleting one post of a bulk delete.
+    """
+
+    post_id: str  # ID of the post
+    status: Literal["deleted", "not_found"]  # not_found if missing or not owned
+
+
+class DeletePostsResponse(BaseModel):
+    """
+    Pydantic model representing the response after deleting posts in bulk.
+    """
+
+    results: list[DeletePostOutcome]  # Outcome per requested ID, in request order
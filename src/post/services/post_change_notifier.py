@@ -0,0 +1,53 @@
+from typing import Iterable
+
+from injector import inject
+
+from src.core.unit_of_work import UnitOfWork
+from src.post.services.post_list_cache import PostListCache
+from src.post.services.post_search_index import PostSearchIndex
+
+
+class PostChangeNotifier:
+    """
+    Keeps the in-memory views of the posts of a user, the cached list pages and
+    the search index, up to date with the posts they create and delete.
+
+    Changes are applied once the transaction of the request is committed, so
+    the views never show posts a rolled back request created or deleted.
+    """
+
+    @inject
+    def __init__(
+        self,
+        unit_of_work: UnitOfWork,
+        post_list_cache: PostListCache,
+        post_search_index: PostSearchIndex,
+    ) -> None:
+        self._unit_of_work = unit_of_work
+        self._post_list_cache = post_list_cache
+        self._post_search_index = post_search_index
+
+    def posts_created(self, user_id: str, posts: Iterable) -> None:
+        """
+        Adds posts, with `id`, `title` and `description` attributes, to the views
+        of a user once committed.
+        """
+        # The cached pages of the user miss the new posts
+        self._unit_of_work.after_commit(
+            lambda: self._post_list_cache.invalidate(user_id)
+        )
+        self._unit_of_work.after_commit(
+            lambda: self._post_search_index.add_posts(user_id, posts)
+        )
+
+    def posts_deleted(self, user_id: str, post_ids: Iterable[str]) -> None:
+        """
+        Removes posts from the views of a user once committed.
+        """
+        # The cached pages of the user hold the deleted posts
+        self._unit_of_work.after_commit(
+            lambda: self._post_list_cache.invalidate(user_id)
+        )
+        self._unit_of_work.after_commit(
+            lambda: self._post_search_index.remove_posts(user_id, post_ids)
+        )
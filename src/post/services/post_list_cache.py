@@ -0,0 +1,10 @@
+from src.core.cache import NamespacedCache
+
+
+class PostListCache(NamespacedCache):
+    """
+    Per-user cache of post list pages.
+
+    Pages are namespaced by user id so every page of a user can be invalidated
+    at once when that user creates or deletes a post.
+    """
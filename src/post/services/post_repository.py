@@ -1,22 +1,43 @@
+from typing import AsyncIterator, Sequence
 from injector import inject
-from sqlalchemy import select, delete
+from sqlalchemy import Row, and_, delete, func, insert, or_, select
+from sqlalchemy.dialects.mysql import match
+from src.core.db.client import DbClient
+from src.core.pagination import KeysetCursor
 from src.core.unit_of_work import UnitOfWork
 from src.user.models import User
 from src.post.models import Post
 
+# Columns needed to build a PostResponseSchema
+POST_RESPONSE_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.description,
+    Post.created_by_id,
+    Post.created_at,
+)
+
 
 class PostRepository:
+    """
+    Queries of posts, run in the transaction of the request's unit of work.
+
+    Methods only execute or flush statements, the unit of work commits them.
+    """
+
     @inject
-    def __init__(self, unit_of_work: UnitOfWork):
+    def __init__(self, unit_of_work: UnitOfWork, db_client: DbClient):
         """
         Initializes the PostRepository with a UnitOfWork instance.
 
         Parameters:
         - unit_of_work (UnitOfWork): The unit of work instance to manage database sessions.
+        - db_client (DbClient): The database client, for queries outliving the unit of work.
         """
         self._unit_of_work = unit_of_work
+        self._db_client = db_client
 
-    async def create(self, post: Post) -> int:
+    async def create(self, post: Post) -> str:
         """
         Creates a new post in the database.
 
@@ -24,20 +45,49 @@ class PostRepository:
         - post (Post): The post object to be created.
 
         Returns:
-        - int: The ID of the newly created post.
+        - str: The ID of the newly created post.
         """
         session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            post_db = Post(
-                id=post.id,
-                title=post.title,
-                description=post.description,
-                created_at=post.created_at,
-                created_by_id=post.created_by_id,
-            )
-            session.add(post_db)
+        post_db = Post(
+            id=post.id,
+            title=post.title,
+            description=post.description,
+            created_at=post.created_at,
+            created_by_id=post.created_by_id,
+        )
+        session.add(post_db)
+        await session.flush([post_db])
         return post_db.id
 
+    async def create_many(self, posts: Sequence[Post]) -> list[str]:
+        """
+        Creates posts in the database.
+
+        The posts are inserted with a single multi-row INSERT instead of one
+        statement per post.
+
+        Parameters:
+        - posts (Sequence[Post]): The post objects to be created.
+
+        Returns:
+        - list[str]: The IDs of the newly created posts, in order.
+        """
+        session = await self._unit_of_work.get_db_session()
+        await session.execute(
+            insert(Post),
+            [
+                {
+                    "id": post.id,
+                    "title": post.title,
+                    "description": post.description,
+                    "created_at": post.created_at,
+                    "created_by_id": post.created_by_id,
+                }
+                for post in posts
+            ],
+        )
+        return [post.id for post in posts]
+
     async def get_by_id(self, id: str) -> Post:
         """
         Retrieves a post by its ID from the database.
@@ -49,45 +99,210 @@ class PostRepository:
         - Post: The retrieved post object.
         """
         session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            result = await session.execute(select(Post).filter(Post.id == id))
-            post = result.scalars().first()
+        result = await session.execute(select(Post).filter(Post.id == id))
+        post = result.scalars().first()
         return post
 
-    async def get_posts_with_user_email(self, email):
+    async def get_posts_with_user_email(
+        self,
+        email: str,
+        limit: int,
+        after: KeysetCursor | None = None,
+        count_total: bool = False,
+    ) -> Sequence[Row]:
         """
-        Retrieves all posts associated with a user's email address from the database.
+        Retrieves a page of posts associated with a user's email address from the database.
+
+        Posts are ordered by (created_at, id) and the page starts right after the
+        position stored in the given cursor. The user is joined in the same statement
+        and only the columns of the post response are selected, so rows are returned
+        as lightweight tuples instead of ORM entities.
 
         Parameters:
         - email (str): The email address of the user.
+        - limit (int): The maximum number of posts to return.
+        - after (KeysetCursor | None): The position of the last post of the previous page.
+        - count_total (bool): Whether to add a `total_results` column with the number
+          of posts of the user.
 
         Returns:
-        - list[Post]: A list of post objects associated with the user's email address.
+        - list[Row]: A list of post rows associated with the user's email address.
         """
-        session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            users = await session.execute(select(User).filter(User.email == email))
-            user = users.scalars().first()
-            result = await session.execute(
-                select(Post).filter(Post.created_by_id == user.id)
+        query = (
+            select(*POST_RESPONSE_COLUMNS)
+            .join(User, User.id == Post.created_by_id)
+            .filter(User.email == email)
+        )
+        if after:
+            query = query.filter(
+                or_(
+                    Post.created_at > after.created_at,
+                    and_(Post.created_at == after.created_at, Post.id > after.id),
+                )
+            )
+        if count_total:
+            total_results = (
+                select(func.count(Post.id))
+                .join(User, User.id == Post.created_by_id)
+                .filter(User.email == email)
+                .scalar_subquery()
             )
-            posts = result.scalars().all()
+            query = query.add_columns(total_results.label("total_results"))
+
+        session = await self._unit_of_work.get_db_session(read_only=True)
+        result = await session.execute(
+            query.order_by(Post.created_at, Post.id).limit(limit)
+        )
+        posts = result.all()
         return posts
 
-    async def delete_by_id(self, id: str, user_id: int) -> bool:
+    async def get_posts_by_ids(self, ids: Sequence[str]) -> Sequence[Row]:
         """
-        Deletes a post by its ID from the database.
+        Retrieves the posts with the given IDs from the database, in no particular order.
+
+        Parameters:
+        - ids (Sequence[str]): The IDs of the posts to retrieve.
+
+        Returns:
+        - list[Row]: The rows of the posts that exist.
+        """
+        if not ids:
+            return []
+        session = await self._unit_of_work.get_db_session(read_only=True)
+        result = await session.execute(
+            select(*POST_RESPONSE_COLUMNS).filter(Post.id.in_(ids))
+        )
+        posts = result.all()
+        return posts
+
+    async def search_posts(
+        self, user_id: str, query: str, limit: int, offset: int
+    ) -> tuple[int, Sequence[Row]]:
+        """
+        Searches the posts of a user with the MySQL full-text index on title and description.
+
+        Parameters:
+        - user_id (str): The ID of the user who created the posts.
+        - query (str): The search terms, in natural language mode.
+        - limit (int): The maximum number of posts to return.
+        - offset (int): The number of best matching posts to skip.
+
+        Returns:
+        - tuple[int, list[Row]]: The number of matching posts and the post rows of
+          the page, with a `score` column, best match first.
+        """
+        relevance = match(
+            Post.title.expression, Post.description.expression, against=query
+        )
+        condition = and_(Post.created_by_id == user_id, relevance)
+        session = await self._unit_of_work.get_db_session(read_only=True)
+        result = await session.execute(
+            select(
+                *POST_RESPONSE_COLUMNS,
+                relevance.label("score"),
+                func.count().over().label("total_results"),
+            )
+            .filter(condition)
+            .order_by(relevance.desc(), Post.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        posts = result.all()
+        if posts:
+            total_results = posts[0].total_results
+        else:
+            # The page is past the last match, count the matches on their own
+            total_results = await session.scalar(
+                select(func.count(Post.id)).filter(condition)
+            )
+        return total_results, posts
+
+    async def stream_posts_by_user_id(
+        self, user_id: str, chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Streams every post of a user from the database, ordered by (created_at, id).
+
+        Posts are read through a server-side cursor on a connection of their own,
+        so only one chunk of rows is held in memory at a time and the stream can
+        outlive the request transaction. The connection is to a read replica
+        unless the request is pinned to the primary.
+
+        Parameters:
+        - user_id (str): The ID of the user who created the posts.
+        - chunk_size (int): The number of rows fetched from the cursor at a time.
+
+        Returns:
+        - AsyncIterator[Sequence[Row]]: Chunks of post rows.
+        """
+        query = (
+            select(*POST_RESPONSE_COLUMNS)
+            .filter(Post.created_by_id == user_id)
+            .order_by(Post.created_at, Post.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        read_only = not self._unit_of_work.is_pinned_to_primary
+        async with self._db_client.connect(read_only=read_only) as conn:
+            result = await conn.stream(query)
+            try:
+                async for rows in result.partitions():
+                    yield rows
+            finally:
+                await result.close()
+
+    async def delete_many(
+        self, ids: Sequence[str], user_id: str, chunk_size: int
+    ) -> set[str]:
+        """
+        Deletes the posts of a user with the given IDs from the database.
+
+        Each chunk of IDs is deleted with a single `DELETE ... WHERE id IN (...)`
+        statement, all in the transaction of the unit of work. The deleted IDs are read back with
+        RETURNING when the database supports it, otherwise the matching rows are
+        locked and selected first.
+
+        Parameters:
+        - ids (Sequence[str]): The IDs of the posts to delete.
+        - user_id (str): The ID of the user who created the posts.
+        - chunk_size (int): The maximum number of IDs per statement.
+
+        Returns:
+        - set[str]: The IDs of the posts that were deleted.
+        """
+        deleted_ids: set[str] = set()
+        session = await self._unit_of_work.get_db_session()
+        delete_returning = session.bind.dialect.delete_returning
+        for start in range(0, len(ids), chunk_size):
+            end = start + chunk_size
+            condition = and_(
+                Post.id.in_(ids[start:end]),
+                Post.created_by_id == user_id,
+            )
+            if delete_returning:
+                result = await session.execute(
+                    delete(Post).where(condition).returning(Post.id)
+                )
+            else:
+                result = await session.execute(
+                    select(Post.id).where(condition).with_for_update()
+                )
+                await session.execute(delete(Post).where(condition))
+            deleted_ids.update(result.scalars())
+        return deleted_ids
+
+    async def delete_by_id(self, id: str, user_id: str) -> bool:
+        """
+        Deletes a post of a user by its ID from the database, in a single statement.
 
         Parameters:
         - id (str): The ID of the post to delete.
-        - user_id (int): The ID of the user who created the post.
+        - user_id (str): The ID of the user who created the post.
 
         Returns:
         - bool: True if the post was successfully deleted, False otherwise.
         """
         session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            result = await session.execute(
-                delete(Post).where(Post.id == id, Post.created_by_id == user_id)
-            )
-            return bool(result.rowcount)
+        result = await session.execute(
+            delete(Post).where(Post.id == id, Post.created_by_id == user_id)
+        )
+        return bool(result.rowcount)
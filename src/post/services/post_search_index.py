@@ -0,0 +1,214 @@
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import AsyncIterator, Callable, Iterable, Sequence
+
+from sqlalchemy import Row
+
+from src.core.cache import NamespacedCache
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits a text into lowercase word tokens.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index of the posts of one user, ranked with BM25.
+
+    Postings are stored as arrays of document numbers so a user with millions
+    of posts stays in the tens of megabytes. Removed posts are tombstoned, and
+    once they make up half of the index the live posts are renumbered and the
+    tombstones dropped from every table.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self) -> None:
+        self._post_ids: list[str | None] = []  # Document number to post id
+        self._document_numbers: dict[str, int] = {}
+        self._lengths = array("I")
+        self._postings: dict[str, array] = {}
+        self._frequencies: dict[str, array] = {}
+        self._total_length = 0
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._document_numbers)
+
+    def add(self, post_id: str, title: str, description: str) -> None:
+        if post_id in self._document_numbers:
+            self.remove(post_id)
+        document_number = len(self._post_ids)
+        tokens = tokenize(title) + tokenize(description)
+        self._post_ids.append(post_id)
+        self._document_numbers[post_id] = document_number
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        for term, frequency in Counter(tokens).items():
+            if term not in self._postings:
+                self._postings[term] = array("I")
+                self._frequencies[term] = array("H")
+            self._postings[term].append(document_number)
+            self._frequencies[term].append(min(frequency, 0xFFFF))
+
+    def remove(self, post_id: str) -> None:
+        document_number = self._document_numbers.pop(post_id, None)
+        if document_number is None:
+            return
+        self._post_ids[document_number] = None
+        self._total_length -= self._lengths[document_number]
+        self._removed += 1
+        if self._removed * 2 > len(self._post_ids):
+            self._compact()
+
+    def search(
+        self, query: str, limit: int, offset: int = 0
+    ) -> tuple[int, list[tuple[str, float]]]:
+        """
+        Ranks the posts matching any term of a query.
+
+        Returns:
+        - tuple[int, list[tuple[str, float]]]: The number of matching posts and
+          the (post id, score) pairs of the requested page, best match first.
+        """
+        documents = len(self._document_numbers)
+        if not documents:
+            return 0, []
+        average_length = self._total_length / documents or 1
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            # Tombstones left until the next compaction don't count as matches
+            matches = [
+                (document_number, frequency)
+                for document_number, frequency in zip(postings, self._frequencies[term])
+                if self._post_ids[document_number] is not None
+            ]
+            if not matches:
+                continue
+            idf = math.log(1 + (documents - len(matches) + 0.5) / (len(matches) + 0.5))
+            for document_number, frequency in matches:
+                norm = self.K1 * (
+                    1
+                    - self.B
+                    + self.B * self._lengths[document_number] / average_length
+                )
+                scores[document_number] = scores.get(document_number, 0.0) + idf * (
+                    frequency * (self.K1 + 1) / (frequency + norm)
+                )
+        best = heapq.nlargest(
+            offset + limit, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+        return len(scores), [
+            (post_id, score)
+            for document_number, score in best[offset:]
+            if (post_id := self._post_ids[document_number]) is not None
+        ]
+
+    def _compact(self) -> None:
+        # Renumber the live documents in order, which keeps the ranking of ties
+        numbers = array("l", [-1]) * len(self._post_ids)
+        post_ids: list[str | None] = []
+        lengths = array("I")
+        for number, post_id in enumerate(self._post_ids):
+            if post_id is not None:
+                numbers[number] = len(post_ids)
+                self._document_numbers[post_id] = len(post_ids)
+                post_ids.append(post_id)
+                lengths.append(self._lengths[number])
+        for term in list(self._postings):
+            postings, frequencies = self._postings[term], self._frequencies[term]
+            kept = [i for i, number in enumerate(postings) if numbers[number] >= 0]
+            if not kept:
+                del self._postings[term], self._frequencies[term]
+                continue
+            self._postings[term] = array("I", (numbers[postings[i]] for i in kept))
+            self._frequencies[term] = array("H", (frequencies[i] for i in kept))
+        self._post_ids = post_ids
+        self._lengths = lengths
+        self._removed = 0
+
+
+class PostSearchIndex:
+    """
+    Per-user inverted indexes of posts, for databases without full-text search.
+
+    The index of a user is built from the database on their first search and
+    then updated incrementally as they create and delete posts. Indexes expire
+    after a time to live so that processes which didn't see a write catch up.
+    """
+
+    def __init__(self, enabled: bool, max_users: int, ttl: float) -> None:
+        """
+        Initializes the PostSearchIndex.
+
+        Parameters:
+        - enabled (bool): Whether posts are searched in-process, False when the
+          database has a full-text index.
+        - max_users (int): The maximum number of user indexes kept in memory.
+        - ttl (float): The number of seconds a user index is kept for.
+        """
+        self.enabled = enabled
+        self._indexes = NamespacedCache(
+            max_namespaces=max_users,
+            ttl=ttl,
+            entries_per_namespace=1,
+            enabled=enabled,
+        )
+
+    async def get(
+        self,
+        user_id: str,
+        load_posts: Callable[[], AsyncIterator[Sequence[Row]]],
+    ) -> InvertedIndex:
+        """
+        Returns the index of a user, building it from `load_posts` on a miss.
+        """
+
+        async def build() -> InvertedIndex:
+            index = InvertedIndex()
+            async for rows in load_posts():
+                for row in rows:
+                    index.add(row.id, row.title, row.description)
+            return index
+
+        return await self._indexes.get_or_load(user_id, None, build)
+
+    def add_posts(self, user_id: str, posts: Iterable) -> None:
+        """
+        Adds posts, with `id`, `title` and `description` attributes, to the index
+        of a user.
+        """
+        if not self.enabled:
+            return
+        index = self._indexes.get(user_id, None)
+        if index is None:
+            # Don't let a build in flight cache an index missing these posts
+            self._indexes.invalidate(user_id)
+            return
+        for post in posts:
+            index.add(post.id, post.title, post.description)
+
+    def remove_posts(self, user_id: str, post_ids: Iterable[str]) -> None:
+        """
+        Removes posts from the index of a user.
+        """
+        if not self.enabled:
+            return
+        index = self._indexes.get(user_id, None)
+        if index is None:
+            self._indexes.invalidate(user_id)
+            return
+        for post_id in post_ids:
+            index.remove(post_id)
@@ -0,0 +1,63 @@
+import uuid
+from typing import Annotated
+from injector import Inject
+from pydantic import Field
+from sqlalchemy.exc import IntegrityError
+from src.core.auth import Principal
+from src.core.use_cases import UseCase, UseCaseHandler
+from src.post.errors import PostErrors
+from src.post.services.post_change_notifier import PostChangeNotifier
+from src.post.services.post_repository import PostRepository
+from src.post.schemas import Post, AddPostsResponseSchema
+from src.post.models import Post as postDBModel
+from src.settings import POST_BATCH_MAX_SIZE
+
+
+class CreatePosts(UseCase):
+    """Use case to create posts in bulk."""
+
+    # Posts to create, validated together before anything is written
+    posts: Annotated[list[Post], Field(min_length=1, max_length=POST_BATCH_MAX_SIZE)]
+
+    class Handler(UseCaseHandler["CreatePosts", AddPostsResponseSchema]):
+        """Handler for the bulk create posts use case."""
+
+        def __init__(
+            self,
+            post_repository: Inject[PostRepository],
+            post_change_notifier: Inject[PostChangeNotifier],
+            principal: Inject[Principal],
+        ) -> None:
+            self._post_repository = post_repository
+            self._post_change_notifier = post_change_notifier
+            self._principal = principal
+
+        async def execute(self, use_case: "CreatePosts") -> AddPostsResponseSchema:
+            """Execute the use case to create posts.
+
+            All posts are inserted in one transaction, so either every post is
+            created or none is.
+
+            Args:
+            - use_case: The use case instance containing the posts details.
+
+            Returns:
+            - AddPostsResponseSchema: The response schema containing the created post IDs.
+            """
+            user_id = self._principal.user_id
+            posts = [
+                postDBModel(
+                    id=str(uuid.uuid4()),
+                    title=post.title,
+                    description=post.description,
+                    created_at=post.created_at,
+                    created_by_id=user_id,
+                )
+                for post in use_case.posts
+            ]
+            try:
+                post_ids = await self._post_repository.create_many(posts)
+            except IntegrityError as e:
+                raise PostErrors.POST_ALREADY_EXISTS from e
+            self._post_change_notifier.posts_created(user_id, posts)
+            return AddPostsResponseSchema(post_ids=post_ids)
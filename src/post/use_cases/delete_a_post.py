@@ -1,33 +1,18 @@
-from typing import Optional
-
-import jwt
-from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
 from injector import Inject
 from sqlalchemy.exc import IntegrityError
 
-from src.core.errors import AuthErrors
-from src.user.models import User
-
+from src.core.auth import Principal
 from src.core.use_cases import UseCase, UseCaseHandler
 from src.post.errors import PostErrors
+from src.post.services.post_change_notifier import PostChangeNotifier
 from src.post.services.post_repository import PostRepository
 from src.post.schemas import DeletePostRequestSchema, DeletePostResponse
-from src.settings import (
-    ACCESS_TOKEN_SECRET_KEY,
-    ACCESS_TOKEN_ALGORITHM,
-    OAUTH_TOKEN_URL,
-)
-from src.user.services.user_repository import UserRepository
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=OAUTH_TOKEN_URL)
 
 
 class DeleteAPost(UseCase):
     """Use case to delete a post."""
 
     post_id: str
-    token: Optional[str] = Depends(oauth2_scheme)
 
     class Handler(UseCaseHandler["DeleteAPost", DeletePostRequestSchema]):
         """Handler for the delete post use case."""
@@ -35,10 +20,12 @@ class DeleteAPost(UseCase):
         def __init__(
             self,
             post_repository: Inject[PostRepository],
-            user_repository: Inject[UserRepository],
+            post_change_notifier: Inject[PostChangeNotifier],
+            principal: Inject[Principal],
         ) -> None:
             self._post_repository = post_repository
-            self._user_repository = user_repository
+            self._post_change_notifier = post_change_notifier
+            self._principal = principal
 
         async def execute(self, use_case: "DeleteAPost"):
             """Execute the use case to delete a post.
@@ -46,60 +33,26 @@ class DeleteAPost(UseCase):
             Args:
             - use_case: The use case instance containing the post ID to delete.
             """
-            user = await self.verify_token(use_case.token)
-            if user:
-                return await self.delete_by_id(use_case.post_id, user.id)
+            return await self.delete_by_id(use_case.post_id, self._principal.user_id)
 
-        async def delete_by_id(self, id: str, user_id: int) -> DeletePostResponse:
+        async def delete_by_id(self, id: str, user_id: str) -> DeletePostResponse:
             """Delete a post by its ID.
 
             Args:
             - id: The ID of the post to delete.
+            - user_id: The ID of the user deleting the post, who must own it.
 
             Returns:
-            - str: A message indicating the result of the deletion operation.
+            - DeletePostResponse: A message indicating the result of the deletion operation.
             """
             try:
-                # Attempt to delete the post by its ID
+                # Only a post owned by the user is deleted, so a zero rowcount
+                # means the post doesn't exist or belongs to someone else
                 is_deleted = await self._post_repository.delete_by_id(id, user_id)
-                # Check if the post was successfully deleted
-                if await self._post_repository.get_by_id(id) is None and is_deleted:
-                    return DeletePostResponse(success="Post Deleted Successfully")
-                else:
-                    raise PostErrors.POST_NOT_FOUND
             except IntegrityError as e:
                 # If the post is not found, raise an error
                 raise PostErrors.POST_NOT_FOUND from e
-
-        async def verify_token(self, token: str = Depends(oauth2_scheme)) -> User:
-            """Verify the access token.
-
-            Args:
-            - token: The access token to be verified.
-
-            Returns:
-            - User: The user associated with the token if valid.
-            """
-            try:
-                # Decode the access token
-                payload = jwt.decode(
-                    token, ACCESS_TOKEN_SECRET_KEY, algorithms=[ACCESS_TOKEN_ALGORITHM]
-                )
-                email: str = payload.get("email")
-                if email is None:
-                    # If email not found in token, raise error
-                    raise HTTPException(
-                        status_code=401, detail=AuthErrors.ACCESS_TOKEN_INVALID
-                    )
-                else:
-                    return await self._user_repository.get_token_by_email(email)
-            except jwt.ExpiredSignatureError as e:
-                # If token has expired, raise error
-                raise HTTPException(
-                    status_code=401, detail=AuthErrors.ACCESS_TOKEN_INVALID
-                ) from e
-            except jwt.DecodeError as e:
-                # If token decoding fails, raise error
-                raise HTTPException(
-                    status_code=401, detail=AuthErrors.ACCESS_TOKEN_INVALID
-                ) from e
+            if not is_deleted:
+                raise PostErrors.POST_NOT_FOUND
+            self._post_change_notifier.posts_deleted(user_id, [id])
+            return DeletePostResponse(success="Post Deleted Successfully")
@@ -0,0 +1,60 @@
+from typing import Annotated
+from injector import Inject
+from pydantic import Field
+from src.core.auth import Principal
+from src.core.use_cases import UseCase, UseCaseHandler
+from src.post.services.post_change_notifier import PostChangeNotifier
+from src.post.services.post_repository import PostRepository
+from src.post.schemas import DeletePostOutcome, DeletePostsResponse
+from src.settings import POST_BULK_DELETE_CHUNK_SIZE, POST_BULK_DELETE_MAX_SIZE
+
+
+class DeletePosts(UseCase):
+    """Use case to delete posts in bulk."""
+
+    post_ids: Annotated[
+        list[str], Field(min_length=1, max_length=POST_BULK_DELETE_MAX_SIZE)
+    ]
+
+    class Handler(UseCaseHandler["DeletePosts", DeletePostsResponse]):
+        """Handler for the bulk delete posts use case."""
+
+        def __init__(
+            self,
+            post_repository: Inject[PostRepository],
+            post_change_notifier: Inject[PostChangeNotifier],
+            principal: Inject[Principal],
+        ) -> None:
+            self._post_repository = post_repository
+            self._post_change_notifier = post_change_notifier
+            self._principal = principal
+
+        async def execute(self, use_case: "DeletePosts") -> DeletePostsResponse:
+            """Execute the use case to delete posts.
+
+            Only posts created by the current user are deleted, other IDs are
+            reported as not found.
+
+            Args:
+            - use_case: The use case instance containing the post IDs to delete.
+
+            Returns:
+            - DeletePostsResponse: The outcome of the deletion of each post.
+            """
+            user_id = self._principal.user_id
+            # Duplicated IDs are deleted once and reported for each occurrence
+            post_ids = list(dict.fromkeys(use_case.post_ids))
+            deleted_ids = await self._post_repository.delete_many(
+                post_ids, user_id, POST_BULK_DELETE_CHUNK_SIZE
+            )
+            if deleted_ids:
+                self._post_change_notifier.posts_deleted(user_id, deleted_ids)
+            return DeletePostsResponse(
+                results=[
+                    DeletePostOutcome(
+                        post_id=post_id,
+                        status="deleted" if post_id in deleted_ids else "not_found",
+                    )
+                    for post_id in use_case.post_ids
+                ]
+            )
@@ -0,0 +1,52 @@
+from typing import AsyncIterator, Sequence
+from injector import Inject
+from sqlalchemy import Row
+from src.core.auth import Principal
+from src.core.use_cases import UseCase, UseCaseHandler
+from src.post.services.post_repository import PostRepository
+from src.post.schemas import PostResponseSchema
+from src.settings import POST_EXPORT_CHUNK_SIZE
+
+
+class ExportPosts(UseCase):
+    """Use case to export every post of the current user."""
+
+    class Handler(UseCaseHandler["ExportPosts", AsyncIterator[bytes]]):
+        """Handler for the export posts use case."""
+
+        def __init__(
+            self,
+            post_repository: Inject[PostRepository],
+            principal: Inject[Principal],
+        ) -> None:
+            self._post_repository = post_repository
+            self._principal = principal
+
+        async def execute(self, use_case: "ExportPosts") -> AsyncIterator[bytes]:
+            """Execute the use case to export posts.
+
+            Args:
+            - use_case: The use case instance.
+
+            Returns:
+            - AsyncIterator[bytes]: Chunks of NDJSON lines, one post per line.
+            """
+            return self.serialize(
+                self._post_repository.stream_posts_by_user_id(
+                    self._principal.user_id, POST_EXPORT_CHUNK_SIZE
+                )
+            )
+
+        @staticmethod
+        async def serialize(
+            chunks: AsyncIterator[Sequence[Row]],
+        ) -> AsyncIterator[bytes]:
+            """Serialize chunks of post rows as NDJSON, one chunk at a time."""
+            async for rows in chunks:
+                yield b"".join(
+                    PostResponseSchema.model_validate(row, from_attributes=True)
+                    .model_dump_json()
+                    .encode()
+                    + b"\n"
+                    for row in rows
+                )
@@ -1,29 +1,18 @@
+from operator import attrgetter
 from typing import Optional
-from fastapi import Depends, HTTPException, Security
-from fastapi.security import OAuth2PasswordBearer
 from injector import Inject
-import jwt
 from sqlalchemy.exc import IntegrityError
-from src.core.errors import AuthErrors
+from src.core.auth import Principal
+from src.core.cache import async_cached
+from src.core.pagination import KeysetCursor, decode_cursor, encode_cursor
+from src.core.schemas import PaginatedResult
+from src.core.unit_of_work import UnitOfWork
 from src.core.use_cases import UseCase, UseCaseHandler
 from src.post.errors import PostErrors
+from src.post.services.post_list_cache import PostListCache
 from src.post.services.post_repository import PostRepository
 from src.post.schemas import GetPostRequestSchema, PostResponseSchema
-from src.settings import (
-    ACCESS_TOKEN_SECRET_KEY,
-    ACCESS_TOKEN_ALGORITHM,
-    OAUTH_TOKEN_URL,
-)
-from src.user.services.user_repository import UserRepository
-from src.user.models import User
-
-import cachetools
-
-# OAuth2 Password Bearer for token authentication
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=OAUTH_TOKEN_URL)
-
-# Cache for storing post data for a certain amount of time
-cache = cachetools.TTLCache(maxsize=100, ttl=300)  # Cache for 5 minutes
+from src.settings import POST_PAGE_DEFAULT_SIZE
 
 
 class GetAllPosts(UseCase):
@@ -31,7 +20,8 @@ class GetAllPosts(UseCase):
     Use case for getting all posts.
     """
 
-    token: Optional[str] = Depends(oauth2_scheme)
+    cursor: Optional[str] = None  # Opaque cursor returned with the previous page
+    limit: int = POST_PAGE_DEFAULT_SIZE  # Maximum number of posts per page
 
     class Handler(UseCaseHandler["GetAPost", GetPostRequestSchema]):
         """
@@ -41,81 +31,101 @@ class GetAllPosts(UseCase):
         def __init__(
             self,
             post_repository: Inject[PostRepository],
-            user_repository: Inject[UserRepository],
+            post_list_cache: Inject[PostListCache],
+            principal: Inject[Principal],
+            unit_of_work: Inject[UnitOfWork],
         ) -> None:
             """
             Constructor method.
 
             Args:
                 post_repository (PostRepository): Repository for interacting with post data.
-                user_repository (UserRepository): Repository for interacting with user data.
+                post_list_cache (PostListCache): Per-user cache of post list pages.
+                principal (Principal): The authenticated user of the request.
+                unit_of_work (UnitOfWork): The unit of work of the request.
             """
             self._post_repository = post_repository
-            self._user_repository = user_repository
+            self._post_list_cache = post_list_cache
+            self._principal = principal
+            self._unit_of_work = unit_of_work
 
-        async def execute(self, use_case: "GetAllPosts") -> list[PostResponseSchema]:
+        async def execute(
+            self, use_case: "GetAllPosts"
+        ) -> PaginatedResult[PostResponseSchema]:
             """
-            Executes the use case to get all posts.
+            Executes the use case to get a page of posts.
 
             Args:
                 use_case (GetAllPosts): The use case instance.
 
             Returns:
-                list[PostResponseSchema]: List of post response schemas.
+                PaginatedResult[PostResponseSchema]: A page of post response schemas.
             """
-            user = await self.verify_token(use_case.token)
-            if user:
-                return await self.prepare_post_response(email=user.email)
-
-        @cachetools.cached(cache)
-        async def prepare_post_response(self, email) -> list[PostResponseSchema]:
+            return await self.prepare_post_response(
+                user_id=self._principal.user_id,
+                email=self._principal.email,
+                cursor=use_case.cursor,
+                limit=use_case.limit,
+            )
+
+        @async_cached(
+            cache=attrgetter("_post_list_cache"),
+            key=lambda self, user_id, email, cursor, limit: (user_id, (cursor, limit)),
+            # Pages cached from a lagging replica may miss the client's own writes
+            skip=lambda self: self._unit_of_work.is_pinned_to_primary,
+        )
+        async def prepare_post_response(
+            self, user_id: str, email: str, cursor: Optional[str], limit: int
+        ) -> PaginatedResult[PostResponseSchema]:
             """
             Prepares the post response.
 
+            Pages are cached per user, and concurrent requests for the same page
+            share a single query.
+
             Args:
+                user_id (str): ID of the user.
                 email (str): Email of the user.
+                cursor (str, optional): Opaque cursor returned with the previous page.
+                limit (int): Maximum number of posts per page.
 
             Returns:
-                list[PostResponseSchema]: List of post response schemas.
+                PaginatedResult[PostResponseSchema]: A page of post response schemas.
             """
+            after = decode_cursor(cursor) if cursor else None
             try:
-                posts = await self._post_repository.get_posts_with_user_email(email)
-                if len(posts) < 1:
-                    raise PostErrors.NO_POSTS_ASSOCIATED
-                else:
-                    return posts
+                # Fetch one extra post to know whether there is a next page
+                posts = await self._post_repository.get_posts_with_user_email(
+                    email, limit + 1, after, count_total=not after
+                )
             except IntegrityError as e:
                 raise PostErrors.POST_CREATION_ERROR from e
-
-        async def verify_token(self, token: str = Depends(oauth2_scheme)) -> User:
-            """
-            Verifies the JWT token.
-
-            Args:
-                token (str, optional): JWT token. Defaults to Depends(oauth2_scheme).
-
-            Returns:
-                User: User object if token is valid.
-            """
-            try:
-                payload = jwt.decode(
-                    token, ACCESS_TOKEN_SECRET_KEY, algorithms=[ACCESS_TOKEN_ALGORITHM]
-                )
-                email: str = payload.get("email")
-                if email is None:
-                    raise HTTPException(
-                        status_code=401, detail=AuthErrors.ACCESS_TOKEN_INVALID
+            if after:
+                page_number = after.page_number + 1
+                total_results = after.total_results
+            elif len(posts) < 1:
+                raise PostErrors.NO_POSTS_ASSOCIATED
+            else:
+                page_number = 1
+                total_results = posts[0].total_results
+
+            next_cursor = None
+            if len(posts) > limit:
+                posts = posts[:limit]
+                next_cursor = encode_cursor(
+                    KeysetCursor(
+                        created_at=posts[-1].created_at,
+                        id=posts[-1].id,
+                        page_number=page_number,
+                        total_results=total_results,
                     )
-                else:
-                    is_valid_email = await self._user_repository.get_token_by_email(
-                        email
-                    )
-                    return is_valid_email
-            except jwt.ExpiredSignatureError:
-                raise HTTPException(
-                    status_code=401, detail=AuthErrors.ACCESS_TOKEN_INVALID
-                )
-            except jwt.DecodeError:
-                raise HTTPException(
-                    status_code=401, detail=AuthErrors.ACCESS_TOKEN_INVALID
                 )
+            return PaginatedResult[PostResponseSchema](
+                page_number=page_number,
+                total_results=total_results,
+                results=[
+                    PostResponseSchema.model_validate(post, from_attributes=True)
+                    for post in posts
+                ],
+                next_cursor=next_cursor,
+            )
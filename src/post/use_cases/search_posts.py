@@ -0,0 +1,116 @@
+from typing import Annotated
+from injector import Inject
+from pydantic import Field
+from src.core.auth import Principal
+from src.core.schemas import PaginatedResult
+from src.core.use_cases import UseCase, UseCaseHandler
+from src.post.services.post_repository import PostRepository
+from src.post.services.post_search_index import PostSearchIndex
+from src.post.schemas import PostSearchResultSchema
+from src.settings import POST_EXPORT_CHUNK_SIZE, POST_PAGE_DEFAULT_SIZE
+
+
+class SearchPosts(UseCase):
+    """
+    Use case for searching the posts of the current user by title and description.
+    """
+
+    query: Annotated[str, Field(min_length=1, max_length=255)]  # Search terms
+    page: int = 1  # Page of the ranked results, starting at 1
+    limit: int = POST_PAGE_DEFAULT_SIZE  # Maximum number of posts per page
+
+    class Handler(
+        UseCaseHandler["SearchPosts", PaginatedResult[PostSearchResultSchema]]
+    ):
+        """
+        Handler for executing the SearchPosts use case.
+        """
+
+        def __init__(
+            self,
+            post_repository: Inject[PostRepository],
+            post_search_index: Inject[PostSearchIndex],
+            principal: Inject[Principal],
+        ) -> None:
+            """
+            Constructor method.
+
+            Args:
+                post_repository (PostRepository): Repository for interacting with post data.
+                post_search_index (PostSearchIndex): In-process indexes, for databases
+                    without full-text search.
+                principal (Principal): The authenticated user of the request.
+            """
+            self._post_repository = post_repository
+            self._post_search_index = post_search_index
+            self._principal = principal
+
+        async def execute(
+            self, use_case: "SearchPosts"
+        ) -> PaginatedResult[PostSearchResultSchema]:
+            """
+            Executes the use case to get a page of the posts matching a search.
+
+            Args:
+                use_case (SearchPosts): The use case instance.
+
+            Returns:
+                PaginatedResult[PostSearchResultSchema]: A page of matching posts, best
+                match first.
+            """
+            user_id = self._principal.user_id
+            offset = (use_case.page - 1) * use_case.limit
+            if self._post_search_index.enabled:
+                total_results, results = await self.search_in_process(
+                    user_id, use_case.query, use_case.limit, offset
+                )
+            else:
+                total_results, posts = await self._post_repository.search_posts(
+                    user_id, use_case.query, use_case.limit, offset
+                )
+                results = [
+                    PostSearchResultSchema.model_validate(post, from_attributes=True)
+                    for post in posts
+                ]
+            return PaginatedResult[PostSearchResultSchema](
+                page_number=use_case.page,
+                total_results=total_results,
+                results=results,
+            )
+
+        async def search_in_process(
+            self, user_id: str, query: str, limit: int, offset: int
+        ) -> tuple[int, list[PostSearchResultSchema]]:
+            """
+            Ranks the posts with the in-process index of the user, then loads the
+            posts of the page.
+
+            Args:
+                user_id (str): ID of the user.
+                query (str): The search terms.
+                limit (int): Maximum number of posts per page.
+                offset (int): Number of best matching posts to skip.
+
+            Returns:
+                tuple[int, list[PostSearchResultSchema]]: The number of matching posts
+                and the posts of the page.
+            """
+            index = await self._post_search_index.get(
+                user_id,
+                lambda: self._post_repository.stream_posts_by_user_id(
+                    user_id, POST_EXPORT_CHUNK_SIZE
+                ),
+            )
+            total_results, ranked = index.search(query, limit, offset)
+            posts = {
+                post.id: post
+                for post in await self._post_repository.get_posts_by_ids(
+                    [post_id for post_id, _ in ranked]
+                )
+            }
+            return total_results, [
+                PostSearchResultSchema(**posts[post_id]._mapping, score=score)
+                for post_id, score in ranked
+                # Posts indexed by a write that was rolled back don't exist
+                if post_id in posts
+            ]
@@ -1,4 +1,4 @@
-from os import getenv
+from os import cpu_count, getenv
 from dotenv import load_dotenv
 
 load_dotenv()  # take environment variables from .env.
@@ -9,7 +9,25 @@ DB_HOST = getenv("DB_HOST", "localhost")
 DB_PORT = int(getenv("DB_PORT", 3306))
 DB_NAME = getenv("DB_NAME", "assessment")
 DB_ECHO = getenv("DB_ECHO", "0") != "0"
-DB_URL = f"mysql+aiomysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(getenv("DB_POOL_TIMEOUT", 30))
+# Recycle connections before MySQL's wait_timeout closes them on its side
+DB_POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", 3600))
+# Test connections on checkout so the pool recovers after a MySQL restart
+DB_POOL_PRE_PING = getenv("DB_POOL_PRE_PING", "1") != "0"
+# Connections opened at startup so the first requests don't pay for connecting
+DB_POOL_WARM_UP_SIZE = int(getenv("DB_POOL_WARM_UP_SIZE", DB_POOL_SIZE))
+# Seconds to wait at startup for the database to accept connections
+DB_STARTUP_TIMEOUT = float(getenv("DB_STARTUP_TIMEOUT", 30))
+DB_URL = getenv(
+    "DB_URL",
+    f"mysql+aiomysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
+)
+# Comma separated URLs of read replicas, read-only queries are spread over them
+DB_REPLICA_URLS = [url for url in getenv("DB_REPLICA_URLS", "").split(",") if url]
+# Seconds a client that wrote keeps reading from the primary, to cover replica lag
+DB_READ_YOUR_WRITES_WINDOW = float(getenv("DB_READ_YOUR_WRITES_WINDOW", 5))
 ACCESS_TOKEN_ALGORITHM = getenv("ACCESS_TOKEN_ALGORITHM", "HS256")
 ACCESS_TOKEN_Time_DELTA = getenv("ACCESS_TOKEN_ALGORITHM", 1)
 ACCESS_TOKEN_SECRET_KEY = getenv("ACCESS_TOKEN_SECRET_KEY", "MySecretKeyForJWT123!@#")
@@ -17,3 +35,56 @@ ACCESS_TOKEN_ISSUER = getenv("ACCESS_TOKEN_ISSUER")
 ACCESS_TOKEN_AUDIENCE = getenv("ACCESS_TOKEN_AUDIENCE")
 ACCESS_TOKEN_LEEWAY = int(getenv("ACCESS_TOKEN_LEEWAY", 10))
 OAUTH_TOKEN_URL = getenv("OAUTH_TOKEN_URL", "/api/pre/user/login")
+POST_PAGE_DEFAULT_SIZE = int(getenv("POST_PAGE_DEFAULT_SIZE", 50))
+POST_PAGE_MAX_SIZE = int(getenv("POST_PAGE_MAX_SIZE", 500))
+# Worker processes of the production server, see `python -m src --production`
+SERVER_WORKERS = int(getenv("SERVER_WORKERS", 1))
+# Post list pages and search indexes are cached in-process and only the worker
+# handling a write sees it, so with several workers the list cache is off and
+# search indexes expire quickly unless configured otherwise
+POST_CACHE_ENABLED = (
+    getenv("POST_CACHE_ENABLED", "1" if SERVER_WORKERS == 1 else "0") != "0"
+)
+POST_CACHE_MAX_USERS = int(getenv("POST_CACHE_MAX_USERS", 1000))
+POST_CACHE_PAGES_PER_USER = int(getenv("POST_CACHE_PAGES_PER_USER", 16))
+POST_CACHE_TTL = int(getenv("POST_CACHE_TTL", 300))
+METRICS_ENABLED = getenv("METRICS_ENABLED", "1") != "0"
+POST_BATCH_MAX_SIZE = int(getenv("POST_BATCH_MAX_SIZE", 1000))
+POST_BULK_DELETE_MAX_SIZE = int(getenv("POST_BULK_DELETE_MAX_SIZE", 10000))
+# Number of ids per DELETE statement, bounded by the placeholders a database accepts
+POST_BULK_DELETE_CHUNK_SIZE = int(getenv("POST_BULK_DELETE_CHUNK_SIZE", 500))
+POST_EXPORT_CHUNK_SIZE = int(getenv("POST_EXPORT_CHUNK_SIZE", 1000))
+POST_SEARCH_INDEX_MAX_USERS = int(getenv("POST_SEARCH_INDEX_MAX_USERS", 100))
+POST_SEARCH_INDEX_TTL = int(
+    getenv("POST_SEARCH_INDEX_TTL", 3600 if SERVER_WORKERS == 1 else 10)
+)
+# scrypt cost parameters, stored passwords are rehashed on login when they change
+PASSWORD_SCRYPT_N = int(getenv("PASSWORD_SCRYPT_N", 2**14))
+PASSWORD_SCRYPT_R = int(getenv("PASSWORD_SCRYPT_R", 8))
+PASSWORD_SCRYPT_P = int(getenv("PASSWORD_SCRYPT_P", 1))
+PASSWORD_HASH_WORKERS = int(getenv("PASSWORD_HASH_WORKERS", cpu_count() or 1))
+PASSWORD_HASH_QUEUE_SIZE = int(getenv("PASSWORD_HASH_QUEUE_SIZE", 64))
+# Serialize post responses with precompiled pydantic serializers
+FAST_JSON_RESPONSES = getenv("FAST_JSON_RESPONSES", "1") != "0"
+# Request bodies above these sizes, in bytes, are rejected with a 413
+MAX_REQUEST_BODY_SIZE = int(getenv("MAX_REQUEST_BODY_SIZE", 1024 * 1024))
+POST_BATCH_MAX_BODY_SIZE = int(getenv("POST_BATCH_MAX_BODY_SIZE", 16 * 1024 * 1024))
+# Requests are profiled when sampled or sent with the secret in an X-Profile header
+PROFILING_SAMPLE_RATE = float(getenv("PROFILING_SAMPLE_RATE", 0))
+PROFILING_SECRET = getenv("PROFILING_SECRET")
+PROFILING_DIR = getenv("PROFILING_DIR", "profiles")
+PROFILING_INTERVAL = float(getenv("PROFILING_INTERVAL", 0.005))
+PROFILING_MAX_FILES = int(getenv("PROFILING_MAX_FILES", 100))
+# Statements slower than this, in seconds, are logged without their parameters
+DB_SLOW_QUERY_THRESHOLD = float(getenv("DB_SLOW_QUERY_THRESHOLD", 0.5))
+# Statements executed this many times by one request are logged, 0 to disable
+DB_REPEATED_QUERY_THRESHOLD = int(getenv("DB_REPEATED_QUERY_THRESHOLD", 2))
+# Send the number and total duration of statements in X-DB-Queries and X-DB-Time
+DB_QUERY_HEADERS = getenv("DB_QUERY_HEADERS", "0") != "0"
+# Production server, see `python -m src --production`
+SERVER_KEEP_ALIVE = int(getenv("SERVER_KEEP_ALIVE", 5))
+SERVER_BACKLOG = int(getenv("SERVER_BACKLOG", 2048))
+# Connections and requests beyond this limit get a 503, unlimited when 0
+SERVER_LIMIT_CONCURRENCY = int(getenv("SERVER_LIMIT_CONCURRENCY", 0)) or None
+SERVER_GRACEFUL_SHUTDOWN_TIMEOUT = int(getenv("SERVER_GRACEFUL_SHUTDOWN_TIMEOUT", 30))
+SERVER_ACCESS_LOG = getenv("SERVER_ACCESS_LOG", "1") != "0"
@@ -1,6 +1,14 @@
-from injector import Binder, Module
+from injector import Binder, Module, provider, singleton
 
+from src.settings import (
+    PASSWORD_HASH_QUEUE_SIZE,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_SCRYPT_N,
+    PASSWORD_SCRYPT_P,
+    PASSWORD_SCRYPT_R,
+)
 from src.user import interfaces
+from src.user.services.password_hasher import PasswordHasher
 from src.user.services.user_repository import (
     UserRepository,
 )
@@ -9,3 +17,14 @@ from src.user.services.user_repository import (
 class UserModule(Module):
     def configure(self, binder: Binder) -> None:
         binder.bind(interfaces.UserRepository, UserRepository)  # type: ignore[type-abstract]
+
+    @singleton
+    @provider
+    def provide_password_hasher(self) -> PasswordHasher:
+        return PasswordHasher(
+            n=PASSWORD_SCRYPT_N,
+            r=PASSWORD_SCRYPT_R,
+            p=PASSWORD_SCRYPT_P,
+            max_workers=PASSWORD_HASH_WORKERS,
+            max_pending=PASSWORD_HASH_QUEUE_SIZE,
+        )
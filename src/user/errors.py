@@ -22,6 +22,11 @@ class UserErrors:
         "An error occurred during user update",
         400,
     )
+    PASSWORD_HASHER_BUSY = RequestException(
+        "PASSWORD_HASHER_BUSY",
+        "Too many logins at once, please retry",
+        503,
+    )
 
     @staticmethod
     def dynamic_error(
@@ -9,6 +9,20 @@ class UserRepository(Protocol):
     async def get_by_id(self, user_id: str) -> ResponseSignupSchema | None:
         ...
 
+    async def get_by_email(self, email: str) -> User | None:
+        ...
+
+    async def update_credentials(
+        self,
+        user_id: str,
+        token: str | None = None,
+        password: str | None = None,
+    ) -> None:
+        ...
+
+    async def get_token_by_email(self, email: str) -> User | None:
+        ...
+
     async def signup_user(
         self,
         user: User,
@@ -0,0 +1,132 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from src.user.errors import UserErrors
+
+T = TypeVar("T")
+
+SCHEME = "scrypt"
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords with scrypt in a bounded thread pool.
+
+    scrypt is CPU and memory hard, so it runs in worker threads instead of the
+    event loop (hashlib releases the GIL while hashing). At most `max_workers`
+    hashes run at once and `max_pending` more may wait for a worker; beyond
+    that, requests are rejected rather than queued without bound.
+
+    Hashes are stored as `scrypt$<n>$<r>$<p>$<salt>$<hash>`. Passwords stored
+    before hashing was introduced are plaintext and still verify, and
+    `needs_rehash` tells when a stored password should be hashed again with
+    the current cost parameters.
+    """
+
+    SALT_SIZE = 16
+    HASH_SIZE = 32
+
+    def __init__(
+        self, n: int, r: int, p: int, max_workers: int, max_pending: int
+    ) -> None:
+        """
+        Initializes the PasswordHasher.
+
+        Parameters:
+        - n (int): The scrypt CPU/memory cost, a power of 2.
+        - r (int): The scrypt block size.
+        - p (int): The scrypt parallelization factor.
+        - max_workers (int): The maximum number of hashes computed at once.
+        - max_pending (int): The maximum number of hashes waiting for a worker.
+        """
+        self._n, self._r, self._p = n, r, p
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self._slots = asyncio.Semaphore(max_workers + max_pending)
+        # Verified against when the user doesn't exist, so that unknown emails
+        # take as long to reject as wrong passwords
+        self._dummy_hash = self._hash(b"", os.urandom(self.SALT_SIZE), n, r, p)
+
+    async def hash(self, password: str) -> str:  # noqa: A003
+        """
+        Returns the hash of a password, with a new salt and the current cost.
+
+        :raises RequestException: If too many hashes are already pending.
+        """
+        salt = os.urandom(self.SALT_SIZE)
+        return await self._run(
+            self._hash, password.encode(), salt, self._n, self._r, self._p
+        )
+
+    async def verify(self, password: str, stored: str | None) -> bool:
+        """
+        Checks a password against a stored hash, or against a legacy plaintext
+        password. A missing stored password never verifies but takes as long.
+
+        :raises RequestException: If too many hashes are already pending.
+        """
+        if stored is None:
+            await self._run(self._verify, password, self._dummy_hash)
+            return False
+        if not stored.startswith(SCHEME + "$"):
+            return hmac.compare_digest(password.encode(), stored.encode())
+        return await self._run(self._verify, password, stored)
+
+    def needs_rehash(self, stored: str) -> bool:
+        """
+        Whether a stored password is plaintext or hashed with other cost
+        parameters than the current ones.
+        """
+        return not stored.startswith(f"{SCHEME}${self._n}${self._r}${self._p}$")
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._slots.locked():
+            raise UserErrors.PASSWORD_HASHER_BUSY
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+
+    @classmethod
+    def _hash(cls, password: bytes, salt: bytes, n: int, r: int, p: int) -> str:
+        digest = hashlib.scrypt(
+            password,
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            # scrypt needs 128 * n * r * p bytes, above the default limit
+            maxmem=256 * n * r * p,
+            dklen=cls.HASH_SIZE,
+        )
+        return "$".join(
+            (SCHEME, str(n), str(r), str(p), _b64encode(salt), _b64encode(digest))
+        )
+
+    @classmethod
+    def _verify(cls, password: str, stored: str) -> bool:
+        try:
+            _, n, r, p, salt, _ = stored.split("$")
+            expected = cls._hash(
+                password.encode(), _b64decode(salt), int(n), int(r), int(p)
+            )
+        except ValueError:
+            return False
+        return hmac.compare_digest(expected.encode(), stored.encode())
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
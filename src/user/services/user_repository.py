@@ -1,4 +1,4 @@
-from sqlalchemy import Select, select
+from sqlalchemy import Select, select, update
 from typing import List, Tuple
 from injector import Inject
 from src.user import interfaces
@@ -18,40 +18,47 @@ class UserRepository(interfaces.UserRepository):
         :return: User object if found, None otherwise.
         """
         session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            result = await session.execute(select(User).filter(User.id == user_id))
-            user = result.scalars().first()
+        result = await session.execute(select(User).filter(User.id == user_id))
+        user = result.scalars().first()
         return user
 
-    async def login_with_email_and_pass(self, email, password):
+    async def get_by_email(self, email: str) -> User | None:
         """
-        Perform user login with email and password.
+        Retrieve a user from the database by its email address.
+
+        The password is compared by the caller, since it is stored hashed.
 
         :param email: Email address of the user.
-        :param password: Password of the user.
-        :return: User object if login is successful, None otherwise.
+        :return: User object if found, None otherwise.
         """
         session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            result = await session.execute(
-                select(User).filter(User.email == email, User.password == password)
-            )
-            user = result.scalars().first()
+        result = await session.execute(select(User).filter(User.email == email))
+        user = result.scalars().first()
         return user
 
-    async def update_token(self, user_id: int, token: str) -> None:
+    async def update_credentials(
+        self,
+        user_id: str,
+        token: str | None = None,
+        password: str | None = None,
+    ) -> None:
         """
-        Update the JWT token associated with the user in the database.
+        Update the JWT token and/or the password hash of the user in the database
+        with a single UPDATE statement.
 
-        :param user_id: ID of the user whose token needs to be updated.
-        :param token: New JWT token to be updated.
+        :param user_id: ID of the user whose credentials need to be updated.
+        :param token: New JWT token, None to keep the current one.
+        :param password: New password hash, None to keep the current one.
         """
+        values = {}
+        if token is not None:
+            values["token"] = token
+        if password is not None:
+            values["password"] = password
+        if not values:
+            return
         session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            user = await session.get(User, user_id)
-            if user:
-                user.token = token
-                session.add(user)
+        await session.execute(update(User).where(User.id == user_id).values(**values))
 
     async def signup_user(self, user: User) -> None:
         session = await self._unit_of_work.get_db_session()
@@ -65,10 +72,9 @@ class UserRepository(interfaces.UserRepository):
         :param email: Email address of the user.
         :return: User object if found, None otherwise.
         """
-        session = await self._unit_of_work.get_db_session()
-        async with session.begin():
-            result = await session.execute(select(User).filter(User.email == email))
-            user = result.scalars().first()
+        session = await self._unit_of_work.get_db_session(read_only=True)
+        result = await session.execute(select(User).filter(User.email == email))
+        user = result.scalars().first()
         return user
 
     async def save(self, user: User) -> None:
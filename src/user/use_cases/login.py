@@ -1,6 +1,6 @@
-from _datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
 
-from jose import jwt
+import jwt
 
 from src.settings import ACCESS_TOKEN_SECRET_KEY, ACCESS_TOKEN_ALGORITHM
 from src.user.errors import UserErrors
@@ -9,6 +9,7 @@ from src.core.use_cases import UseCase, UseCaseHandler
 from src.user.schemas import (
     ResponseSignupSchema,
 )
+from src.user.services.password_hasher import PasswordHasher
 from src.user.services.user_repository import (
     UserRepository,
 )
@@ -22,13 +23,16 @@ class Login(UseCase):
         def __init__(
             self,
             user_repository: Inject[UserRepository],
+            password_hasher: Inject[PasswordHasher],
         ) -> None:
             """
             Initializes the Login use case handler with the user repository dependency.
 
             :param user_repository: Instance of UserRepository for database interaction.
+            :param password_hasher: Service hashing and verifying passwords.
             """
             self._user_repository = user_repository
+            self._password_hasher = password_hasher
 
         async def execute(self, use_case: "Login") -> ResponseSignupSchema:
             """
@@ -37,43 +41,29 @@ class Login(UseCase):
             :param use_case: Instance of the Login use case.
             :return: ResponseSignupSchema containing the JWT token.
             """
-            # Attempt to login with the provided email and password
-            user = await self._user_repository.login_with_email_and_pass(
-                email=use_case.email,
-                password=use_case.password,
+            user = await self._user_repository.get_by_email(use_case.email)
+            stored_password = user.password if user else None
+            is_verified = await self._password_hasher.verify(
+                use_case.password, stored_password
             )
-            if not user:
-                # If user is not found, raise an error
+            if not user or stored_password is None or not is_verified:
+                # If user is not found or the password is wrong, raise an error
                 raise UserErrors.EMAIL_OR_PASSWORD_INCORRECT
-            # if the previous token is still valid
-            is_valid = await self.validate_token(user.token)
-            token = user.token if is_valid else self.generate_token(use_case.email)
-            # Update the user's token in the database
-            await self._user_repository.update_token(user.id, token)
-
-            return await self.prepare_user_response(
-                use_case.email, use_case.password, token
-            )
-
-        async def prepare_user_response(
-            self, email: str, password: str, token: str
-        ) -> ResponseSignupSchema:
-            """
-            Prepares the user response with the JWT token.
+            changes = {}
+            if self._password_hasher.needs_rehash(stored_password):
+                # Plaintext passwords and outdated hashes are upgraded on login
+                changes["password"] = await self._password_hasher.hash(
+                    use_case.password
+                )
+            # Keep the previous token while it is still valid
+            token = user.token
+            if token is None or not await self.validate_token(token):
+                token = changes["token"] = self.generate_token(use_case.email)
+            if changes:
+                # Only written when something changed, in a single statement
+                await self._user_repository.update_credentials(user.id, **changes)
 
-            :param email: Email of the user.
-            :param password: Password of the user.
-            :param token: JWT token.
-            :return: ResponseSignupSchema containing the token.
-            """
-            # Attempt to login with the provided email and password
-            user = await self._user_repository.login_with_email_and_pass(
-                email, password
-            )
-            if not user:
-                # If user is not found, raise an error
-                raise UserErrors.USER_NOT_FOUND
-            return ResponseSignupSchema(token=token, token_type="bearer")
+            return ResponseSignupSchema(token=token)
 
         def generate_token(self, email: str) -> str:
             """
@@ -92,17 +82,15 @@ class Login(UseCase):
                 payload, ACCESS_TOKEN_SECRET_KEY, algorithm=ACCESS_TOKEN_ALGORITHM
             )
 
-        async def validate_token(self, token) -> bool:
+        async def validate_token(self, token: str) -> bool:
             try:
-                payload = jwt.decode(
-                    token, ACCESS_TOKEN_SECRET_KEY, algorithms=[ACCESS_TOKEN_ALGORITHM]
-                )
-                token_time = payload.get("exp")
-                utc_now = datetime.now(timezone.utc)
-                expiration_time_utc = datetime.utcfromtimestamp(token_time).replace(
-                    tzinfo=timezone.utc
+                # Checks the signature and that the token hasn't expired
+                jwt.decode(
+                    token,
+                    ACCESS_TOKEN_SECRET_KEY,
+                    algorithms=[ACCESS_TOKEN_ALGORITHM],
+                    options={"require": ["exp"]},
                 )
-                if expiration_time_utc > utc_now:
-                    return True
-            except (jwt.ExpiredSignatureError, jwt.JWTError, Exception):
+            except jwt.InvalidTokenError:
                 return False
+            return True
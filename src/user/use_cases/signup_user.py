@@ -9,6 +9,7 @@ from src.user.schemas import (
     RequestSignupSchema,
     ResponseSignupSchema,
 )
+from src.user.services.password_hasher import PasswordHasher
 from src.user.services.user_repository import (
     UserRepository,
 )
@@ -28,8 +29,10 @@ class SignupUser(UseCase):
         def __init__(
             self,
             user_repository: Inject[UserRepository],
+            password_hasher: Inject[PasswordHasher],
         ) -> None:
             self._user_repository = user_repository
+            self._password_hasher = password_hasher
 
         async def execute(self, use_case: "SignupUser") -> ResponseSignupSchema:
             user_id = str(uuid.uuid4())
@@ -37,7 +40,7 @@ class SignupUser(UseCase):
             user = User(
                 id=user_id,
                 email=use_case.email,
-                password=use_case.password,
+                password=await self._password_hasher.hash(use_case.password),
                 token=self.generate_token(use_case.email),
             )
             await self.create_user(user)
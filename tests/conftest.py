@@ -0,0 +1,11 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def db_url(tmp_path: Path) -> str:
+    """
+    URL of a SQLite database of its own for the test.
+    """
+    return f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+from injector import singleton
+
+from src.app import app, injector
+from src.core.db.client import DbClient
+from src.core.db.models import Base
+from src.post.services.post_list_cache import PostListCache
+
+POST = {"title": "title", "description": "description", "created_at": "2024-01-01"}
+
+
+async def list_posts_twice(db_url: str) -> tuple[int, int]:
+    """
+    Creates a post and lists the posts twice through the app, without read
+    replicas, and returns the cache hits and misses of the listings.
+    """
+    db_client = DbClient(db_url)
+    injector.binder.bind(DbClient, to=db_client, scope=singleton)
+    await db_client.create_all(Base.metadata)
+    stats = injector.get(PostListCache).stats
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/api/pre/user/signup",
+                json={"email": "cache@example.com", "password": "password"},
+            )
+            headers = {"Authorization": f"Bearer {response.json()['token']}"}
+            response = await client.post("/api/pre/post/", json=POST, headers=headers)
+            response.raise_for_status()
+
+            hits, misses = stats.hits, stats.misses
+            for _ in range(2):
+                response = await client.get("/api/pre/post/", headers=headers)
+                assert response.json()["total_results"] == 1
+            return stats.hits - hits, stats.misses - misses
+    finally:
+        await db_client.dispose()
+
+
+def test_post_list_cache_hits_without_replicas(db_url: str) -> None:
+    # Authenticating reads the user from the primary session, which must not be
+    # taken for a write skipping the cache
+    assert asyncio.run(list_posts_twice(db_url)) == (1, 1)
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from src.core.db.client import DbClient
+from src.core.db.models import Base
+from src.core.db.query_stats import QueryStats, QueryTracker, track_queries
+from src.core.unit_of_work import UnitOfWork
+from src.post.models import Post
+from src.post.services.post_repository import PostRepository
+from src.user.models import User
+
+OWNER_ID = "owner"
+OTHER_USER_ID = "other user"
+POST_ID = "post"
+
+
+async def create_db_client(db_url: str) -> DbClient:
+    """
+    Returns a client of a database holding one post of the owner, with the
+    statements it executes tracked.
+    """
+    db_client = DbClient(db_url)
+    db_client.add_statement_listener(QueryTracker(slow_query_threshold=60))
+    await db_client.create_all(Base.metadata)
+    async with db_client.connect() as conn, conn.begin():
+        await conn.execute(
+            insert(User),
+            [
+                {"id": user_id, "email": f"{user_id}@example.com", "password": "-"}
+                for user_id in (OWNER_ID, OTHER_USER_ID)
+            ],
+        )
+        await conn.execute(
+            insert(Post),
+            {
+                "id": POST_ID,
+                "title": "title",
+                "description": "description",
+                "created_at": datetime(2024, 1, 1),
+                "created_by_id": OWNER_ID,
+            },
+        )
+    return db_client
+
+
+async def delete_by_id(
+    db_url: str, post_id: str, user_id: str
+) -> tuple[bool, QueryStats, int]:
+    """
+    Deletes a post in a unit of work and returns the outcome, the statements
+    the deletion executed and the number of posts left once committed.
+    """
+    db_client = await create_db_client(db_url)
+    try:
+        async with UnitOfWork(db_client) as unit_of_work:
+            with track_queries() as queries:
+                deleted = await PostRepository(unit_of_work, db_client).delete_by_id(
+                    post_id, user_id
+                )
+        async with db_client.connect() as conn:
+            posts_left = await conn.scalar(select(func.count()).select_from(Post))
+    finally:
+        await db_client.dispose()
+    return deleted, queries, posts_left
+
+
+def count_statements(queries: QueryStats, verb: str) -> int:
+    return sum(
+        count
+        for statement, count in queries.statements.items()
+        if statement.lstrip().upper().startswith(verb)
+    )
+
+
+def test_delete_by_id_issues_a_single_delete(db_url: str) -> None:
+    deleted, queries, posts_left = asyncio.run(delete_by_id(db_url, POST_ID, OWNER_ID))
+
+    assert deleted is True
+    assert count_statements(queries, "DELETE") == 1, queries.statements
+    assert count_statements(queries, "SELECT") == 0, queries.statements
+    assert posts_left == 0
+
+
+@pytest.mark.parametrize(
+    "post_id, user_id",
+    [("missing post", OWNER_ID), (POST_ID, OTHER_USER_ID)],
+    ids=["missing", "not owned"],
+)
+def test_delete_by_id_returns_false_when_nothing_is_deleted(
+    db_url: str, post_id: str, user_id: str
+) -> None:
+    deleted, queries, posts_left = asyncio.run(delete_by_id(db_url, post_id, user_id))
+
+    assert deleted is False
+    assert count_statements(queries, "SELECT") == 0, queries.statements
+    assert posts_left == 1
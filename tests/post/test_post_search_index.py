@@ -0,0 +1,56 @@
+import pytest
+
+from src.post.services.post_search_index import InvertedIndex
+
+WORDS = ["python", "fast", "search", "index", "post", "cache"]
+
+
+def post(number: int) -> tuple[str, str, str]:
+    """Returns the id, title and description of a post made of a few words."""
+    words = [WORDS[(number + i) % len(WORDS)] for i in range(number % 4 + 1)]
+    return f"post {number}", " ".join(words), f"description {number}"
+
+
+def build(numbers: range) -> InvertedIndex:
+    index = InvertedIndex()
+    for number in numbers:
+        index.add(*post(number))
+    return index
+
+
+def postings_size(index: InvertedIndex) -> int:
+    return sum(len(postings) for postings in index._postings.values())
+
+
+def test_index_size_stays_bounded_under_churn() -> None:
+    index = build(range(10))
+    for number in range(10, 10_000):
+        index.add(*post(number))
+        index.remove(post(number - 10)[0])
+
+    assert len(index) == 10
+    # Removed posts are dropped from every table once they make up half of them
+    assert len(index._post_ids) <= 2 * len(index) + 1
+    assert len(index._lengths) == len(index._post_ids)
+    assert postings_size(index) <= 3 * postings_size(build(range(9_990, 10_000)))
+
+
+@pytest.mark.parametrize("removed", [3, 6], ids=["tombstoned", "compacted"])
+def test_scores_only_count_live_posts(removed: int) -> None:
+    index = build(range(12))
+    for number in range(removed):
+        index.remove(post(number)[0])
+    # The same posts indexed without ever removing any
+    expected = build(range(removed, 12))
+
+    for query in ("python", "fast search", "description"):
+        total, results = index.search(query, limit=20)
+        expected_total, expected_results = expected.search(query, limit=20)
+        assert total == expected_total
+        assert [post_id for post_id, _ in results] == [
+            post_id for post_id, _ in expected_results
+        ]
+        assert [score for _, score in results] == pytest.approx(
+            [score for _, score in expected_results]
+        )
+        assert all(score > 0 for _, score in results)